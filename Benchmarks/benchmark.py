@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
+
+# need file to be able to see the Game, Strategies and Simulations folders to run it directly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from Game.GameState import GameState
+from Game.Player import Player
+from Strategies.registry import create_strategy, strategy_names
+from Simulations.SimulationHandler import SimulationEngine, create_random_board
+
+#strategies under test. MCTS always uses its full time limit, so it gets a short one and is
+#compared by iterations per second instead of latency
+STRATEGY_SETTINGS = {"MCTS": {"time_limit": 0.2}}
+STRATEGIES = {name: partial(create_strategy, name, **STRATEGY_SETTINGS.get(name, {})) for name in strategy_names()}
+
+#matchups for the engine throughput benchmark (cheap strategies -> the engine dominates the time)
+ENGINE_MATCHUPS = [("Random", "Random"), ("Greedy", "Greedy")]
+
+#modules whose import time is measured (fresh interpreter every time) and their target in seconds:
+#the game setup window and the simulation workers start without loading pandas or all strategy modules
+STARTUP_TARGETS = {
+    "Game.GameSetup": 0.075,
+    "Simulations.SimulationHandler": 0.25,
+}
+
+#metrics compared against the baseline and whether larger values are better
+COMPARED_METRICS = {
+    "startup_sec": False,
+    "latency_mean": False,
+    "latency_p90": False,
+    "nodes_per_sec": True,
+    "iterations_per_sec": True,
+    "peak_kb": False,
+    "games_per_sec": True,
+}
+
+#moves faster than REPEAT_BELOW seconds are timed up to MAX_REPEATS times (best time counts)
+REPEAT_BELOW = 0.005
+MAX_REPEATS = 20
+
+DEFAULT_SIZES = list(range(3, 13))
+DEFAULT_OUTPUT = os.path.join(current_dir, "results", "benchmark.json")
+DEFAULT_BASELINE = os.path.join(current_dir, "baseline.json")
+
+
+def make_corpus(size, boards, seed):
+    """fixed boards for one size: the same seed always gives the same corpus"""
+    rng = random.Random(f"bench-{seed}-{size}")
+    return [create_random_board(size, rng) for _ in range(boards)]
+
+
+def make_positions(board, seed):
+    """
+    positions of one board the strategies are timed on: the opening, and the positions after
+    a quarter and after half of the cells were taken by seeded random play (fewer if the game ends)
+    """
+    rng = random.Random(seed)
+    state = GameState(board)
+    n_cells = state.n * state.n
+    positions = [state.copy()]
+    for target in (n_cells // 4, n_cells // 2):
+        while state.moves_made < target and not state.is_over():
+            state.apply(rng.choice(state.legal_moves()))
+        if state.is_over():
+            break
+        positions.append(state.copy())
+    return positions
+
+
+def bench_moves(name, size, corpus, seed):
+    """latency, search speed and peak memory of one strategy on all positions of a corpus"""
+    latencies = []
+    nodes = iterations = 0
+    for b, board in enumerate(corpus):
+        for position in make_positions(board, seed + b):
+            #fast moves are repeated and the best time is kept, to keep timer noise out of the baseline
+            best = None
+            for _ in range(MAX_REPEATS):
+                #new strategy per run, so no state (trees, tables) is carried over
+                random.seed(seed + b)
+                strategy = STRATEGIES[name]()
+                start = time.perf_counter()
+                strategy.move(position)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+                if elapsed >= REPEAT_BELOW:
+                    break
+            latencies.append(best)
+            stats = strategy.search_stats()
+            nodes += stats.get("nodes") or 0
+            iterations += stats.get("iterations") or 0
+
+    #peak memory of one move on the opening position, in a separate run (tracemalloc slows the code down)
+    random.seed(seed)
+    strategy = STRATEGIES[name]()
+    position = GameState(corpus[0])
+    tracemalloc.start()
+    strategy.move(position)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "benchmark": "move", "strategy": name, "size": size, "positions": len(latencies),
+        "latency_mean": total / len(latencies),
+        "latency_p50": float(np.percentile(latencies, 50)),
+        "latency_p90": float(np.percentile(latencies, 90)),
+        "latency_max": max(latencies),
+        "nodes_per_sec": nodes / total if nodes else None,
+        "iterations_per_sec": iterations / total if iterations else None,
+        "peak_kb": peak / 1024,
+    }
+
+
+def bench_engine(s1, s2, size, corpus, seed, rounds=3):
+    """complete games per second of the SimulationEngine (both seat orders on every board, best of `rounds`)"""
+    elapsed = None
+    for _ in range(rounds):
+        games = 0
+        start = time.perf_counter()
+        for b, board in enumerate(corpus):
+            for p1, p2 in ((s1, s2), (s2, s1)):
+                random.seed(seed + b)
+                engine = SimulationEngine(Player(p1, False, STRATEGIES[p1]()), Player(p2, False, STRATEGIES[p2]()), board)
+                engine.run_game()
+                games += 1
+        round_time = time.perf_counter() - start
+        elapsed = round_time if elapsed is None else min(elapsed, round_time)
+    return {"benchmark": "engine", "strategy": f"{s1}-{s2}", "size": size, "games": games,
+            "games_per_sec": games / elapsed}
+
+
+def bench_startup(module, rounds=5):
+    """
+    seconds a fresh interpreter needs to import `module` (best of `rounds`), without the start of
+    the interpreter itself
+    """
+    def best(code):
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=parent_dir, check=True)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    startup = max(0.0, best(f"import {module}") - best("pass"))
+    return {"benchmark": "startup", "strategy": module, "size": 0, "startup_sec": startup,
+            "target_sec": STARTUP_TARGETS.get(module)}
+
+
+def run_benchmarks(sizes=None, strategies=None, boards=3, engine_boards=20, seed=0):
+    """runs all benchmarks and returns the machine-readable report (dict, written as JSON)"""
+    sizes = sizes or DEFAULT_SIZES
+    strategies = strategies or list(STRATEGIES)
+    records = []
+    for module, target in STARTUP_TARGETS.items():
+        records.append(bench_startup(module))
+        startup = records[-1]["startup_sec"]
+        flag = "" if startup <= target else f"  (target {target * 1000:.0f} ms)"
+        print(f"import {module:<30} {startup * 1000:9.1f} ms{flag}", file=sys.stderr)
+    for size in sizes:
+        corpus = make_corpus(size, max(boards, engine_boards), seed)
+        for name in strategies:
+            records.append(bench_moves(name, size, corpus[:boards], seed))
+            print(f"{size:>2}x{size:<2} {name:<10} {records[-1]['latency_mean'] * 1000:9.2f} ms/move", file=sys.stderr)
+        for s1, s2 in ENGINE_MATCHUPS:
+            records.append(bench_engine(s1, s2, size, corpus[:engine_boards], seed))
+            print(f"{size:>2}x{size:<2} {s1}-{s2:<10} {records[-1]['games_per_sec']:9.1f} games/s", file=sys.stderr)
+
+    return {
+        "meta": {"date": datetime.now(timezone.utc).isoformat(timespec="seconds"), "python": platform.python_version(),
+                 "machine": platform.machine(), "platform": platform.platform(), "seed": seed, "boards": boards,
+                 "engine_boards": engine_boards},
+        "results": records,
+    }
+
+
+def compare(report, baseline, threshold=0.20):
+    """
+    compares the metrics of every (benchmark, strategy, size) present in both reports.
+    Returns a list of rows (key, metric, baseline value, new value, relative change, regression?)
+    where a regression is a change in the bad direction larger than `threshold`.
+    """
+    old = {(r["benchmark"], r["strategy"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for record in report["results"]:
+        key = (record["benchmark"], record["strategy"], record["size"])
+        if key not in old:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = old[key].get(metric), record.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            rows.append((key, metric, before, after, change, worse > threshold))
+    return rows
+
+
+def print_comparison(rows):
+    for (benchmark, strategy, size), metric, before, after, change, regression in rows:
+        flag = "REGRESSION" if regression else ""
+        print(f"{benchmark:<7} {strategy:<14} {size:>2}  {metric:<18} {before:12.6g} -> {after:12.6g}  {change:+7.1%}  {flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark strategy move latency and engine throughput.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="board sizes (default 3..12)")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--boards", type=int, default=3, help="boards per size for the move benchmarks")
+    parser.add_argument("--engine-boards", type=int, default=20, help="boards per size for the engine benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the board corpora")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON report")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="relative change that counts as regression")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.strategies, args.boards, args.engine_boards, args.seed)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.output}", file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        rows = compare(report, json.load(open(args.baseline)), args.threshold)
+        print_comparison(rows)
+        #non-zero exit code -> can be used as a check before deploying
+        if any(row[-1] for row in rows):
+            sys.exit(1)
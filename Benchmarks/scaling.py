@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use("Agg")   # the plot is only written to a file
+import matplotlib.pyplot as plt
+
+# need file to be able to see the Game, Strategies and Simulations folders to run it directly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from Game.GameState import GameState
+from Benchmarks.benchmark import STRATEGIES
+from Simulations.SimulationHandler import create_random_board
+
+DEFAULT_SIZES = [10, 25, 50, 100, 200, 400]
+DEFAULT_OUTPUT = os.path.join(current_dir, "results")
+
+
+def scaling_positions(board, seed, positions):
+    """
+    the opening and `positions` mid-game positions of one board: after N, 2N, ... seeded random
+    moves (a mid-game move on a large board has ~2N legal moves, the opening N*N)
+    """
+    rng = random.Random(seed)
+    state = GameState(board)
+    result = [state.copy()]
+    for _ in range(positions):
+        for _ in range(state.n):
+            if state.is_over():
+                return result
+            state.apply(rng.choice(state.legal_moves()))
+        if state.is_over():
+            break
+        result.append(state.copy())
+    return result
+
+
+def bench_size(name, size, positions, seed):
+    """latency of the opening move, mean mid-game latency and peak memory of one strategy on one board size"""
+    board = create_random_board(size, random.Random(f"scaling-{seed}-{size}"))
+    states = scaling_positions(board, seed, positions)
+
+    latencies = []
+    iterations = nodes = 0
+    for k, state in enumerate(states):
+        random.seed(seed + k)
+        strategy = STRATEGIES[name]()
+        start = time.perf_counter()
+        strategy.move(state)
+        latencies.append(time.perf_counter() - start)
+        stats = strategy.search_stats()
+        iterations += stats.get("iterations") or 0
+        nodes += stats.get("nodes") or 0
+
+    # peak memory of a mid-game move (the opening if the game ended early), separate run: tracemalloc is slow
+    random.seed(seed)
+    strategy = STRATEGIES[name]()
+    tracemalloc.start()
+    strategy.move(states[-1])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mid = latencies[1:] or latencies
+    total = sum(latencies)
+    return {"strategy": name, "size": size, "opening_latency": latencies[0], "latency_mean": sum(mid) / len(mid),
+            "positions": len(latencies), "peak_kb": peak / 1024,
+            "iterations_per_sec": iterations / total if iterations else None,
+            "nodes_per_sec": nodes / total if nodes else None}
+
+
+def run_scaling(sizes=None, strategies=None, positions=3, seed=0, max_seconds=10.0):
+    """
+    runs every strategy on every size (smallest first). A strategy whose opening or mid-game move took
+    longer than `max_seconds` is not run on the larger sizes.
+    """
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    strategies = strategies or list(STRATEGIES)
+    records = []
+    for name in strategies:
+        for size in sizes:
+            record = bench_size(name, size, positions, seed)
+            records.append(record)
+            print(f"{name:<10} {size:>4}x{size:<4} opening {record['opening_latency'] * 1000:9.2f} ms  "
+                  f"mid-game {record['latency_mean'] * 1000:9.2f} ms  peak {record['peak_kb']:10.1f} KB", file=sys.stderr)
+            if max(record["opening_latency"], record["latency_mean"]) > max_seconds:
+                print(f"{name}: slower than {max_seconds} s per move, larger sizes skipped", file=sys.stderr)
+                break
+
+    return {
+        "meta": {"date": datetime.now(timezone.utc).isoformat(timespec="seconds"), "seed": seed,
+                 "positions": positions, "max_seconds": max_seconds},
+        "results": records,
+    }
+
+
+def plot_scaling(report, path):
+    """move latency (opening and mid-game) and peak memory against N, log-log, one line per strategy"""
+    fig, (ax_time, ax_memory) = plt.subplots(1, 2, figsize=(13, 5))
+    strategies = list(dict.fromkeys(r["strategy"] for r in report["results"]))
+    for name in strategies:
+        rows = [r for r in report["results"] if r["strategy"] == name]
+        sizes = [r["size"] for r in rows]
+        line, = ax_time.plot(sizes, [r["latency_mean"] for r in rows], marker="o", label=name)
+        ax_time.plot(sizes, [r["opening_latency"] for r in rows], linestyle=":", marker=".", color=line.get_color())
+        ax_memory.plot(sizes, [r["peak_kb"] / 1024 for r in rows], marker="o", label=name)
+
+    ax_time.set_title("Move latency (solid: mid-game, dotted: opening)")
+    ax_time.set_ylabel("Seconds per move")
+    ax_memory.set_title("Peak memory of a mid-game move")
+    ax_memory.set_ylabel("MB")
+    for ax in (ax_time, ax_memory):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("Board size N")
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move latency and memory of every strategy against the board size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="board sizes N (default 10..400)")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--positions", type=int, default=3, help="mid-game positions per size")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the boards and positions")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="skip larger sizes once a move takes longer")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="folder for scaling.json and scaling.png")
+    args = parser.parse_args()
+
+    report = run_scaling(args.sizes, args.strategies, args.positions, args.seed, args.max_seconds)
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, "scaling.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    plot_scaling(report, os.path.join(args.output, "scaling.png"))
+    print(f"report and plot written to {args.output}", file=sys.stderr)
@@ -1,5 +1,9 @@
 import tkinter as tk   # import Tkinter library to build the graphical interface (GUI)
 
+# boards of this size and larger are drawn on one Canvas instead of one Button per cell:
+# creating and updating hundreds of Button widgets makes the window slow to open and to react
+CANVAS_FROM = 15
+
 class Board:
     """ The Board class is responsible for creating and managing the Graphical User Interface (GUI)
         of the "RC GAME" using the tkinter library. It handles the visual layout, displays the
@@ -28,6 +32,7 @@ class Board:
         self.ACCENT_P2 = "#B36DE3"  # player 2
         self.ACCENT_P2_SOFT = "#D9C3F6"  # soft border p2
         self.COLOR_CLICKED = "#D988B9"  # for clicked cells
+        self.COLOR_DISABLED = "#A3A3A3"  # text of cells that can not be clicked now (canvas mode)
 
         #  Setup window
         try:
@@ -93,12 +98,20 @@ class Board:
 
         # 2D list to store references to each button, aligned with matrix coordinates
         self.grid_buttons = []
+        # canvas mode: (rectangle, text) item ids of each cell, aligned with matrix coordinates
+        self.cell_items = []
+        # cells that can be clicked right now, so a move only updates the cells whose state changes
+        self.enabled = set()
         # create the grid using the matrix dimension from GameHandler
-        self.create_grid(self.game_handler.dimMat)
+        self.use_canvas = self.game_handler.dimMat >= CANVAS_FROM
+        if self.use_canvas:
+            self.create_canvas_grid(self.game_handler.dimMat)
+        else:
+            self.create_grid(self.game_handler.dimMat)
 
         #Highlights the first player
         # highlight the player who starts (current_player is maintained by GameHandler)
-        self.highlight_current_player(self.game_handler.current_player)
+        self.highlight_current_player(self.game_handler.state.current_player)
 
     def _draw_outlined_title(self, canvas, text, y=35):
         # border
@@ -129,7 +142,7 @@ class Board:
             for c in range(size):
                 btn = tk.Button(
                     self.grid_frame,
-                    text=f"{self.game_handler.matrix[r][c]}",  # display matrix value as text
+                    text=f"{self.game_handler.state.cells[r][c]}",  # display matrix value as text
                     width=btn_w,
                     height=btn_h,
                     bg=self.COLOR_BTN,
@@ -148,6 +161,42 @@ class Board:
                 row_buttons.append(btn)
             # after finishing the row, store its button list in grid_buttons
             self.grid_buttons.append(row_buttons)
+        # on the first move every cell can be clicked
+        self.enabled = {(r, c) for r in range(size) for c in range(size)}
+
+    #  Canvas grid creation (large boards)
+    def create_canvas_grid(self, size):
+        # cell size so the whole board fits below the title and the scores
+        screen = min(self.root.winfo_screenwidth(), self.root.winfo_screenheight() - 200)
+        cell = max(8, screen // size)
+        fsize = max(5, cell // 3)
+        side = cell * size
+
+        # one canvas for the whole board, cells are a rectangle and a text item each
+        self.canvas = tk.Canvas(self.grid_frame, width=side, height=side, bg=self.COLOR_BG, highlightthickness=0)
+        self.canvas.pack()
+        self.cell_size = cell
+        for r in range(size):
+            row_items = []
+            for c in range(size):
+                x, y = c * cell, r * cell
+                rect = self.canvas.create_rectangle(x + 1, y + 1, x + cell - 1, y + cell - 1,
+                                                    fill=self.COLOR_BTN, outline=self.COLOR_BG)
+                text = self.canvas.create_text(x + cell / 2, y + cell / 2, fill=self.COLOR_TEXT,
+                                               text=f"{self.game_handler.state.cells[r][c]}",
+                                               font=("Helvetica", fsize, "bold"))
+                row_items.append((rect, text))
+            self.cell_items.append(row_items)
+
+        # a single click handler for the whole canvas, it finds the cell from the position
+        self.canvas.bind("<Button-1>", self.canvas_clicked)
+        self.enabled = {(r, c) for r in range(size) for c in range(size)}
+
+    def canvas_clicked(self, event):
+        row, col = event.y // self.cell_size, event.x // self.cell_size
+        # like a disabled button: clicks on cells that can not be taken now are ignored
+        if (row, col) in self.enabled:
+            self.cell_clicked(row, col)
 
     # When it is clicked
     def cell_clicked(self, row, col):
@@ -157,13 +206,13 @@ class Board:
 
         # Then refresh UI to reflect the new current player and scores
         # schedule GUI updates right after event handling to keep interface responsive
-        self.root.after(0, lambda: self.highlight_current_player(self.game_handler.current_player))
+        self.root.after(0, lambda: self.highlight_current_player(self.game_handler.state.current_player))
         self.root.after(0, self.update_scores)
 
     #Score update
     def update_scores(self):
         # retrieve current scores from GameHandler
-        s1, s2 = self.game_handler.score
+        s1, s2 = self.game_handler.state.scores
         # update labels for both players with fresh scores
         self.player1_label.config(text=f"{self.game_handler.players[0].getName()}: {s1}")
         self.player2_label.config(text=f"{self.game_handler.players[1].getName()}: {s2}")
@@ -198,31 +247,48 @@ class Board:
         # start the Tkinter main event loop and display the window
         self.root.mainloop()
 
+    def set_cell_enabled(self, row, col, enabled):
+        """make one cell clickable or not (button state or canvas text color)"""
+        if self.use_canvas:
+            self.canvas.itemconfig(self.cell_items[row][col][1], fill=self.COLOR_TEXT if enabled else self.COLOR_DISABLED)
+        else:
+            self.grid_buttons[row][col].config(state="normal" if enabled else "disabled")
+
+    def mark_taken(self, row, col):
+        """show a cell as taken: no value, clicked color, not clickable anymore"""
+        self.enabled.discard((row, col))
+        if self.use_canvas:
+            rect, text = self.cell_items[row][col]
+            self.canvas.itemconfig(rect, fill=self.COLOR_CLICKED)
+            self.canvas.itemconfig(text, text="-", fill=self.COLOR_TEXT)
+        else:
+            self.grid_buttons[row][col].config(text="-", state="disabled", bg=self.COLOR_CLICKED)
+
     def update_active_buttons(self, active_row, active_col):
         """
         Turns off all buttons except for those in the same row or column
         of the clicked cell (if not disabled or marked.)
+        Only the cells whose state changes are updated: the cells of the previous row/column
+        that are not in the new one are disabled, the free cells of the new row/column enabled.
         """
-        # loop over every cell in the board to update its state
-        for r in range(self.game_handler.dimMat):
-            for c in range(self.game_handler.dimMat):
-                button = self.grid_buttons[r][c]
-
-                #if the cell is already clicked, keep it disabled
-                # (matrix stores '-' for cells that have been chosen)
-                if self.game_handler.matrix[r][c] == "-":
-                    button.config(state="disabled", bg=self.COLOR_CLICKED)
-
-                # if it's in the same row or column, keep it active
-                elif r == active_row or c == active_col:
-                    button.config(state="normal")
-                #otherwise, disable it
-                else:
-                    button.config(state="disabled")
+        free = self.game_handler.state.free
+        n = self.game_handler.dimMat
+        # free cells in the same row or column (the state's free mask is False for chosen cells)
+        active = {(active_row, c) for c in range(n) if free[active_row, c]}
+        active.update((r, active_col) for r in range(n) if free[r, active_col])
+
+        for row, col in self.enabled - active:
+            self.set_cell_enabled(row, col, False)
+        for row, col in active - self.enabled:
+            self.set_cell_enabled(row, col, True)
+        self.enabled = active
 
     def disable_all_buttons(self):
         # helper method to make the entire grid non-interactive (e.g., at game end)
-        for r in range(self.game_handler.dimMat):
-            for c in range(self.game_handler.dimMat):
-                button = self.grid_buttons[r][c]
-                button.config(state="disabled")
+        # only the enabled cells have to be changed, all others are disabled already
+        for row, col in self.enabled:
+            self.set_cell_enabled(row, col, False)
+        self.enabled = set()
+
+    def has_active_cells(self):
+        return bool(self.enabled)
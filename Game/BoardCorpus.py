@@ -0,0 +1,89 @@
+import json
+import os
+import random
+import numpy as np
+
+# version of the corpus format, stored in the metadata
+CORPUS_FORMAT = 1
+
+
+class BoardCorpus:
+    """ The BoardCorpus class stores a fixed set of NxN boards in a binary file, so tournaments can be
+        re-run on exactly the same boards without regenerating or parsing them.
+
+        A corpus consists of two files:
+        1. `<name>.npy`: one NumPy array of shape (count, N, N) with the board values (int64).
+           It is opened memory-mapped, so only the boards that are used are read from disk
+           and several processes can share the same file.
+        2. `<name>.json`: metadata with the format version, board size, count, and the seed and
+           generator the boards were created with (None for corpora built from existing boards).
+
+        Boards are generated with the same procedure as `SimulationRunner` uses in memory:
+        random.Random(f"{seed}-boards-{size}") draws randint(low, high) for every cell, row by row,
+        so a corpus generated with seed S contains the boards of a run with seed=S.
+        """
+
+    def __init__(self, path):
+        """opens an existing corpus (path of the .npy file)"""
+        self.path = path
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Board corpus '{path}' not found.")
+        self.boards = np.load(path, mmap_mode="r")
+        if self.boards.ndim != 3 or self.boards.shape[1] != self.boards.shape[2]:
+            raise ValueError(f"Board corpus '{path}' must have shape (count, N, N).")
+
+        meta_path = metadata_path(path)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.metadata = json.load(f)
+        else:
+            self.metadata = {"format": CORPUS_FORMAT, "size": self.boards.shape[1], "count": len(self.boards)}
+
+    @property
+    def size(self):
+        return self.boards.shape[1]
+
+    @property
+    def seed(self):
+        return self.metadata.get("seed")
+
+    def __len__(self):
+        return len(self.boards)
+
+    def board(self, index):
+        """board number `index` as an independent int64 array"""
+        if not 0 <= index < len(self.boards):
+            raise IndexError(f"Board index {index} out of range (corpus has {len(self.boards)} boards).")
+        return np.array(self.boards[index], dtype=np.int64)
+
+    @staticmethod
+    def write(path, boards, **metadata):
+        """
+        saves `boards` (count, N, N) as a corpus, with `metadata` (seed, generator, ...) in the .json file.
+        Returns the opened corpus.
+        """
+        boards = np.asarray(boards, dtype=np.int64)
+        if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+            raise ValueError("Boards must have shape (count, N, N).")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.save(path, boards)
+
+        meta = {"format": CORPUS_FORMAT, "size": boards.shape[1], "count": len(boards), "seed": None, "generator": None}
+        meta.update(metadata)
+        with open(metadata_path(path), "w") as f:
+            json.dump(meta, f, indent=2)
+        return BoardCorpus(path)
+
+    @staticmethod
+    def generate(path, size, count, seed, low=1, high=9):
+        """creates a corpus of `count` random size x size boards with values in [low, high] from `seed`"""
+        rng = random.Random(f"{seed}-boards-{size}")
+        boards = [[[rng.randint(low, high) for _ in range(size)] for _ in range(size)] for _ in range(count)]
+        return BoardCorpus.write(path, boards, seed=seed, low=low, high=high,
+                                 generator="random.Random(f'{seed}-boards-{size}').randint(low, high) per cell, row by row")
+
+
+def metadata_path(path):
+    """metadata file that belongs to the corpus `path` (x.npy -> x.json)"""
+    root, _ = os.path.splitext(path)
+    return root + ".json"
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from Game import Board, fileReading
+from Game.GameState import GameState
 
 
 class GameHandler:
@@ -10,8 +11,8 @@ class GameHandler:
         by the `Board` class.
 
         Responsibilities include:
-        1. Initializing the game board (matrix) by reading data from a file.
-        2. Tracking and updating the scores for the two players (human or computer).
+        1. Initializing the game state (`GameState`) from the board read from a file.
+        2. Tracking and updating the scores for the two players (human or computer) through the state.
         3. Handling both human clicks and computer moves.
         4. Switching turns and enabling/disabling the correct buttons based on the last move
             (limiting moves to the same row or column).
@@ -21,11 +22,9 @@ class GameHandler:
     def __init__(self, player1, player2, root=None):
         self.root = root if root is not None else tk.Tk()
         self.players = [player1, player2] # 0 = P1, 1 = P2
-        self.current_player = 0 # 0 = P1, 1 = P2
-        self.score = [0, 0]
-        self.matrix = fileReading.load_board_until_ok()
-        self.dimMat = len(self.matrix)
-        self.last_move = None
+        # board, free cells, scores, last move and side to move
+        self.state = GameState(fileReading.load_board_until_ok())
+        self.dimMat = self.state.n
 
         # create Board and link this handler
         self.board = Board.Board(self)
@@ -41,14 +40,10 @@ class GameHandler:
     #helpers for ending the game
     def has_any_legal_moves(self) -> bool:
         """
-        Returns True if at least one button is currently clickable (state='normal').
-        Assumes Board.update_active_buttons(...) has set button states correctly.
+        Returns True if at least one cell is currently clickable.
+        Assumes Board.update_active_buttons(...) has set the cell states correctly.
         """
-        for row_btns in self.board.grid_buttons:
-            for btn in row_btns:
-                if str(btn['state']) == 'normal':
-                    return True
-        return False
+        return self.board.has_active_cells()
 
     def end_game_and_announce(self):
         """Disable the board and pop up a winner dialog with player names."""
@@ -57,7 +52,7 @@ class GameHandler:
         # Use chosen names instead of generic "Player 1/2"
         name1 = self.players[0].getName()
         name2 = self.players[1].getName()
-        p1, p2 = self.score
+        p1, p2 = self.state.scores
 
         if p1 > p2:
             winner_name = name1
@@ -76,8 +71,8 @@ class GameHandler:
 
     # Computer turn
     def computer_turn(self):
-        player = self.players[self.current_player]
-        move_result = player.move(self.matrix, self.last_move, self.score)
+        player = self.players[self.state.current_player]
+        move_result = player.move(self.state)
         if move_result is None:
             # No legal moves for this player means game over
             self.end_game_and_announce()
@@ -87,24 +82,16 @@ class GameHandler:
 
     #Handle a click from the board (human or AI)
     def handle_cell_click(self, row, col):
-        print(f"[DEBUG] Player {self.current_player+1} clicked ({row}, {col})")
+        print(f"[DEBUG] Player {self.state.current_player+1} clicked ({row}, {col})")
 
-        # update score for the current player
-        self.score[self.current_player] += self.matrix[row][col]
+        # take the cell: updates score, free cells, last move and switches player
+        self.state.apply((row, col))
         self.board.update_scores()
 
-        # update matrix (mark cell as taken)
-        self.matrix[row][col] = "-"
+        #update the cell on the board
+        self.board.mark_taken(row, col)
 
-        #update the button on the board
-        button = self.board.grid_buttons[row][col]
-        button.config(text="-", state="disabled", bg=self.board.COLOR_CLICKED)
-
-        self.last_move = (row, col)
-
-        # Switch player
-        self.current_player = 1 if self.current_player == 0 else 0
-        self.board.highlight_current_player(self.current_player)
+        self.board.highlight_current_player(self.state.current_player)
 
         #enable legal buttons for the NEXT player based on the last move
         self.board.update_active_buttons(row, col)
@@ -116,7 +103,7 @@ class GameHandler:
             return
 
         # If the next player is a computer, schedule its move
-        if not self.players[self.current_player].is_human:
+        if not self.players[self.state.current_player].is_human:
             self.board.disable_all_buttons()
             self.root.after(1000, self.computer_turn)
 
@@ -4,11 +4,7 @@ import random
 
 from Game import Player
 
-from Strategies.RandomStrategy import RandomStrategy
-from Strategies.safe_choice_strategy import SafeChoiceStrategy
-from Strategies.GreedyStrategy import GreedyStrategy
-from Strategies.MCTS import MCTSStrategy
-from Strategies.minimax_f import AlphaBetaStrategy
+from Strategies import registry
 
 CONSTANT_SEED = 12345
 
@@ -378,15 +374,9 @@ class GameSetup:
             frame, text="Select strategy:", fg=self.COLOR_TEXT, bg=self.COLOR_BG, font=("Arial", 10, "bold")
         ).pack(pady=(2, 2))
 
-        # RadioButtons
-        rb_values = [
-            ("Random Strategy", "random"),
-            ("Safe Choice Strategy", "safe_choice"),
-            ("Greedy Strategy", "greedy"),
-            ("Monte Carlo Tree Search Strategy", "MCTS"),  
-            ("Minimax", "minimax"),
-        ]
-        for text, value in rb_values:
+        # RadioButtons, one per strategy of the registry (only the names, no strategy module is imported here)
+        for value in registry.strategy_names():
+            text = registry.strategy_label(value)
             tk.Radiobutton(
                 frame, text=text, variable=var, value=value,
                 bg=self.COLOR_BG, fg=self.COLOR_TEXT,
@@ -498,19 +488,8 @@ class GameSetup:
             widget.destroy()
 
     def create_strategy(self, strategy_name):
-        match strategy_name:
-            case "random":
-                return RandomStrategy()
-            case "safe_choice":
-                return SafeChoiceStrategy()
-            case "greedy":
-                return GreedyStrategy()
-            case "MCTS":
-                return MCTSStrategy()
-            case "minimax":
-                return AlphaBetaStrategy()
-            case _:
-                raise ValueError(f"Unknown strategy: {strategy_name}")
+        # imports the strategy's module only now, when the game is set up
+        return registry.create_strategy(strategy_name)
 
     # Generates a quadratic Board according to the board size input
     def generate_board(self):
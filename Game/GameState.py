@@ -0,0 +1,138 @@
+import heapq
+import numpy as np
+
+from Game.MoveIndex import MoveIndex
+
+
+class GameState:
+    """ The GameState class is the shared, compact representation of one Row-Column game.
+        It is used by the `GameHandler`, the `SimulationEngine` and every strategy, so the
+        board is never converted between formats while a game is running.
+
+        The state consists of:
+        1. `values`: a read-only, contiguous NxN integer array with the original cell values.
+           Cell values never change during a game, so copies of a state share this array.
+        2. `free`: a boolean NxN mask, True for every cell that can still be taken.
+        3. `scores`: the accumulated scores of player 1 and player 2.
+        4. `last_move`: the (row, col) of the previous move, or None before the first move.
+        5. `current_player`: the side to move (0 = P1, 1 = P2).
+        6. `index`: a `MoveIndex` with the free cells, counts, sums and maxima per row/column.
+
+        Moves are applied with `apply` and can be taken back with `undo`, which lets search
+        strategies work on a single mutable state instead of copying the board.
+        """
+
+    def __init__(self, values):
+        values = np.array(values, dtype=np.int64)
+        if values.ndim != 2 or values.shape[0] != values.shape[1]:
+            raise ValueError("Matrix is not square (requires N×N).")
+        values.setflags(write=False)
+
+        self.values = values                        # original cell values (never modified)
+        self.n = values.shape[0]                    # board dimension
+        self.cells = values.tolist()                # plain-int mirror for fast scalar access in search loops
+        self.free = np.ones((self.n, self.n), dtype=bool)  # True = cell can still be taken
+        self.index = MoveIndex(self.cells)          # incremental legal-move index
+        self.scores = [0, 0]                        # scores of P1 and P2
+        self.last_move = None                       # no moves yet
+        self.current_player = 0                     # 0 = P1, 1 = P2
+        self.moves_made = 0
+        self._history = []                          # (move, previous last_move) for undo
+
+    def copy(self):
+        """
+        Independent copy of the mutable part of the state (values are shared)
+        """
+        other = GameState.__new__(GameState)
+        other.values = self.values
+        other.n = self.n
+        other.cells = self.cells
+        other.free = self.free.copy()
+        other.index = self.index.copy()
+        other.scores = list(self.scores)
+        other.last_move = self.last_move
+        other.current_player = self.current_player
+        other.moves_made = self.moves_made
+        other._history = list(self._history)
+        return other
+
+    def value(self, row, col):
+        return self.cells[row][col]
+
+    def is_free(self, row, col):
+        return bool(self.free[row, col])
+
+    def remaining(self):
+        """number of cells that have not been taken yet"""
+        return self.n * self.n - self.moves_made
+
+    def board(self):
+        """
+        Returns the board as an integer array where taken cells are 0.
+        """
+        return np.where(self.free, self.values, 0)
+
+    def apply(self, move):
+        """
+        Takes the cell `move` for the side to move, updates scores, last move and turn.
+        Returns the value of the taken cell. Legality is not checked here.
+        """
+        row, col = move
+        value = self.cells[row][col]
+        self.free[row, col] = False
+        self.index.take(row, col)
+        self.scores[self.current_player] += value
+        self._history.append((move, self.last_move))
+        self.last_move = (row, col)
+        self.current_player = 1 - self.current_player
+        self.moves_made += 1
+        return value
+
+    def undo(self):
+        """
+        Reverts the most recent `apply` and returns the move that was taken back.
+        """
+        move, previous_last_move = self._history.pop()
+        row, col = move
+        self.current_player = 1 - self.current_player
+        self.scores[self.current_player] -= self.cells[row][col]
+        self.free[row, col] = True
+        self.index.release(row, col)
+        self.last_move = previous_last_move
+        self.moves_made -= 1
+        return move
+
+    def played_moves(self):
+        """all moves applied so far, in order"""
+        return [move for move, _ in self._history]
+
+    def legal_moves(self):
+        """
+        All cells the side to move may take: any free cell on the first move,
+        afterwards only free cells in the row or column of the last move.
+        """
+        return self.index.moves(self.last_move)
+
+    def best_moves(self, k):
+        """
+        The (at most) k legal moves with the highest cell values, highest first; equal values keep
+        their `legal_moves` order. Used by the large-board modes of the search strategies: on the
+        first move the N×N candidates are ranked by NumPy instead of building a list of all cells.
+        """
+        if self.last_move is None:
+            flat = np.flatnonzero(self.free)   # row-major, like legal_moves()
+            order = np.argsort(-self.values.ravel()[flat], kind="stable")[:k]
+            return [divmod(int(i), self.n) for i in flat[order]]
+        # the k best of the row and the k best of the column contain the k best legal moves
+        r, c = self.last_move
+        cells = self.cells
+        cells_row = cells[r]
+        moves = [(r, j) for j in heapq.nlargest(k, self.index.row_free[r], key=cells_row.__getitem__)]
+        moves.extend([(i, c) for i in heapq.nlargest(k, self.index.col_free[c], key=lambda i: cells[i][c])])
+        return heapq.nlargest(k, moves, key=lambda m: cells[m[0]][m[1]])
+
+    def legal_move_count(self):
+        return self.index.move_count(self.last_move)
+
+    def is_over(self):
+        return self.index.move_count(self.last_move) == 0
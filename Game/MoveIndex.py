@@ -0,0 +1,132 @@
+from bisect import insort
+
+
+class MoveIndex:
+    """ The MoveIndex keeps per-row and per-column summaries of the free cells of a board,
+        so legal moves and row/column statistics never require a scan of all NxN cells.
+
+        For every row r (and analogously every column c) it stores:
+        1. `row_free[r]`: sorted list of the free column indices in that row;
+        2. `row_count[r]`: number of free cells;
+        3. `row_sum[r]`: sum of the values of the free cells;
+        4. `row_max[r]`: largest free value (None once the row is empty);
+        5. `row_max_count[r]`: number of free cells holding that value.
+
+        `take` and `release` update the summaries when a cell is taken or given back
+        (undo). Counts and sums are updated in O(1), the free lists in O(N). The maximum
+        is only recomputed (O(N)) when the last free cell holding it is taken.
+        The index is owned and kept in sync by `GameState`.
+        """
+
+    def __init__(self, cells):
+        n = len(cells)
+        self.n = n
+        self.cells = cells   # plain-int values, shared with the GameState (read only)
+
+        self.row_free = [list(range(n)) for _ in range(n)]
+        self.col_free = [list(range(n)) for _ in range(n)]
+        self.row_count = [n] * n
+        self.col_count = [n] * n
+        self.row_sum = [sum(row) for row in cells]
+        self.col_sum = [sum(cells[r][c] for r in range(n)) for c in range(n)]
+        self.row_max = [max(row) for row in cells]
+        self.col_max = [max(cells[r][c] for r in range(n)) for c in range(n)]
+        self.row_max_count = [row.count(top) for row, top in zip(cells, self.row_max)]
+        self.col_max_count = [sum(1 for r in range(n) if cells[r][c] == self.col_max[c]) for c in range(n)]
+        self.free_count = n * n
+
+    def copy(self):
+        other = MoveIndex.__new__(MoveIndex)
+        other.n = self.n
+        other.cells = self.cells
+        other.row_free = [cols[:] for cols in self.row_free]
+        other.col_free = [rows[:] for rows in self.col_free]
+        other.row_count = self.row_count[:]
+        other.col_count = self.col_count[:]
+        other.row_sum = self.row_sum[:]
+        other.col_sum = self.col_sum[:]
+        other.row_max = self.row_max[:]
+        other.col_max = self.col_max[:]
+        other.row_max_count = self.row_max_count[:]
+        other.col_max_count = self.col_max_count[:]
+        other.free_count = self.free_count
+        return other
+
+    def take(self, row, col):
+        """mark (row, col) as taken"""
+        value = self.cells[row][col]
+
+        free_cols = self.row_free[row]
+        free_cols.remove(col)
+        self.row_count[row] -= 1
+        self.row_sum[row] -= value
+        if value == self.row_max[row]:
+            self.row_max_count[row] -= 1
+            if not self.row_max_count[row]:
+                # the last cell holding the maximum was taken: recompute from the remaining cells
+                cells_row = self.cells[row]
+                self.row_max[row], self.row_max_count[row] = _max_and_count([cells_row[c] for c in free_cols])
+
+        free_rows = self.col_free[col]
+        free_rows.remove(row)
+        self.col_count[col] -= 1
+        self.col_sum[col] -= value
+        if value == self.col_max[col]:
+            self.col_max_count[col] -= 1
+            if not self.col_max_count[col]:
+                cells = self.cells
+                self.col_max[col], self.col_max_count[col] = _max_and_count([cells[r][col] for r in free_rows])
+
+        self.free_count -= 1
+
+    def release(self, row, col):
+        """mark (row, col) as free again (inverse of take)"""
+        value = self.cells[row][col]
+
+        insort(self.row_free[row], col)
+        self.row_count[row] += 1
+        self.row_sum[row] += value
+        if self.row_max[row] is None or value > self.row_max[row]:
+            self.row_max[row] = value
+            self.row_max_count[row] = 1
+        elif value == self.row_max[row]:
+            self.row_max_count[row] += 1
+
+        insort(self.col_free[col], row)
+        self.col_count[col] += 1
+        self.col_sum[col] += value
+        if self.col_max[col] is None or value > self.col_max[col]:
+            self.col_max[col] = value
+            self.col_max_count[col] = 1
+        elif value == self.col_max[col]:
+            self.col_max_count[col] += 1
+
+        self.free_count += 1
+
+    def moves(self, last_move):
+        """
+        Legal moves given the previous move: every free cell if last_move is None,
+        otherwise the free cells of its row followed by the free cells of its column.
+        """
+        if last_move is None:
+            return [(r, c) for r in range(self.n) for c in self.row_free[r]]
+        last_r, last_c = last_move
+        # (last_r, last_c) itself is taken, so row and column lists never overlap
+        moves = [(last_r, c) for c in self.row_free[last_r]]
+        moves.extend([(r, last_c) for r in self.col_free[last_c]])
+        return moves
+
+    def move_count(self, last_move):
+        """number of legal moves without building the list"""
+        if last_move is None:
+            return self.free_count
+        last_r, last_c = last_move
+        return self.row_count[last_r] + self.col_count[last_c]
+
+
+def _max_and_count(values):
+    """(largest value, number of times it occurs), (None, 0) for an empty list"""
+    if not values:
+        return None, 0
+    top = max(values)
+    return top, values.count(top)
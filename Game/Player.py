@@ -24,5 +24,5 @@ class Player:
     def getName(self):
         return self.name
 
-    def move(self, matrix, last_move=None, scores=(0, 0)):
-        return self.strategy.move(matrix, last_move, scores)
\ No newline at end of file
+    def move(self, state):
+        return self.strategy.move(state)
\ No newline at end of file
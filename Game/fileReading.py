@@ -1,6 +1,11 @@
 import os
+import warnings
 import numpy as np
 
+from Game.BoardCorpus import BoardCorpus
+
+INT64_MIN, INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+
 def load_board_until_ok(default_name="boards/board.txt"):
     """ The `fileReading` module safely loads and validates the initial game board matrix from a text file.
 
@@ -14,6 +19,7 @@ def load_board_until_ok(default_name="boards/board.txt"):
         2. Square dimensions;
         3. Consistent row lengths;
         4. Numeric data (integers) in every cell.
+        Besides text files, `open_file` also reads binary `.npy` boards (see `save_board`), which are memory-mapped.
 
         Upon success, it returns the data as a NumPy array for use by the main `GameHandler`.
         """
@@ -39,7 +45,7 @@ def load_board_until_ok(default_name="boards/board.txt"):
         try:
             # attempt to load and validate the selected file
             return open_file(candidate)
-        except (FileNotFoundError, ValueError, OSError) as e:
+        except (FileNotFoundError, ValueError, OverflowError, OSError) as e:
             # print the exact error type and message for debugging clarity
             print(f"{type(e).__name__}: {e}")
             print("Let's try again.\n")
@@ -48,17 +54,83 @@ def load_board_until_ok(default_name="boards/board.txt"):
 def open_file(name):
     """
     Read a text file containing either whitespace- or comma-separated integers per line
-    and return a square NumPy matrix (dtype=object).
+    and return a square NumPy integer matrix (dtype=int64).
+    Files ending in `.npy` are read as binary boards (see `open_npy_file`).
+
+    The whole file is parsed at once by NumPy; only if that fails (bad data, or a file mixing both
+    separators) it is parsed again line by line, which either reads it or reports the exact problem.
 
     Raises:
       - FileNotFoundError
-      - ValueError (for non-numeric data, inconsistent rows, non-square, empty)
+      - ValueError (for non-numeric or out-of-range data, inconsistent rows, non-square, empty)
       - OSError (other I/O issues)
     """
     #accept absolute or relative path
     # if the user gives a relative filename, prepend current working directory
     input_file_name = name if os.path.isabs(name) else os.path.join(os.getcwd(), name)
 
+    if input_file_name.lower().endswith(".npy"):
+        return open_npy_file(input_file_name)
+
+    # fast path: the separator of the first line is used for the whole file
+    with open(input_file_name, 'rt') as input_file:
+        first_line = next((line for line in input_file if line.strip()), "")
+    delimiter = ',' if ',' in first_line else None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")   # loadtxt warns about empty files, reported below
+            matrix = np.loadtxt(input_file_name, dtype=np.int64, delimiter=delimiter, comments=None, ndmin=2)
+    except (ValueError, OverflowError):
+        return _parse_lines(input_file_name)
+    if matrix.size == 0:
+        raise ValueError("The file is empty.")   # no usable data found
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Matrix is not square (requires N×N).")
+    return matrix
+
+
+def open_npy_file(name, mmap=True):
+    """
+    Read a binary board (a 2D integer array saved with `np.save`, see `save_board`) and return it as a
+    square NumPy integer matrix. With mmap=True the file is memory-mapped (read-only) instead of read,
+    so large boards are only loaded as far as they are used.
+
+    Raises:
+      - FileNotFoundError
+      - ValueError (no integer matrix, non-square, empty)
+    """
+    if not os.path.exists(name):
+        raise FileNotFoundError(f"Board file '{name}' not found.")
+    matrix = np.load(name, mmap_mode="r" if mmap else None)
+    if matrix.ndim != 2:
+        raise ValueError("Board file must contain a 2D matrix.")
+    if not np.issubdtype(matrix.dtype, np.integer):
+        raise ValueError(f"Board file must contain integers, not {matrix.dtype}.")
+    if matrix.size == 0:
+        raise ValueError("The file is empty.")
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Matrix is not square (requires N×N).")
+    if matrix.dtype != np.int64:
+        matrix = matrix.astype(np.int64)   # other integer types are converted (and then held in memory)
+    return matrix
+
+
+def save_board(name, board):
+    """
+    Write a board as binary `.npy` file (int64, can be memory-mapped by `open_npy_file`) or,
+    for any other extension, as whitespace-separated text readable by `open_file`.
+    """
+    board = np.asarray(board, dtype=np.int64)
+    if board.ndim != 2 or board.shape[0] != board.shape[1]:
+        raise ValueError("Matrix is not square (requires N×N).")
+    if name.lower().endswith(".npy"):
+        np.save(name, board)
+    else:
+        np.savetxt(name, board, fmt="%d")
+
+
+def _parse_lines(input_file_name):
+    """line-by-line parser of `open_file`, with the line number in the error messages"""
     matrix_values = [] # store parsed rows before converting to numpy array
 
     with open(input_file_name, 'rt') as input_file:  # rt = read text
@@ -75,9 +147,13 @@ def open_file(name):
             for value in parts:
                 value = value.strip()
                 try:
-                    row.append(int(value))   # ensure each entry is a valid integer
+                    number = int(value)   # ensure each entry is a valid integer
                 except ValueError:
                     raise ValueError(f"Non-numeric value '{value}' on line {line_number}.")
+                # the board is stored as int64: larger values can not be represented
+                if not INT64_MIN <= number <= INT64_MAX:
+                    raise ValueError(f"Value '{value}' on line {line_number} is out of range.")
+                row.append(number)
             matrix_values.append(row)
 
     if not matrix_values:
@@ -93,5 +169,22 @@ def open_file(name):
     if len(matrix_values) != row_length:
         raise ValueError("Matrix is not square (requires N×N).")
 
-    # Build NumPy array (dtype=object preserves formatting for game use)
-    return np.array(matrix_values, dtype=object)
+    # Build a contiguous integer array; taken cells are tracked by GameState, not in the matrix
+    return np.array(matrix_values, dtype=np.int64)
+
+
+def load_corpus_board(path, index):
+    """
+    Load board number `index` from a binary board corpus (`.npy` file written by `BoardCorpus`)
+    and return it as a square NumPy integer matrix (dtype=int64). Only that board is read from disk.
+
+    Raises:
+      - FileNotFoundError
+      - ValueError (not a corpus of square boards, index out of range)
+    """
+    corpus_path = path if os.path.isabs(path) else os.path.join(os.getcwd(), path)
+    corpus = BoardCorpus(corpus_path)
+    try:
+        return corpus.board(index)
+    except IndexError as e:
+        raise ValueError(str(e))
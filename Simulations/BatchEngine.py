@@ -0,0 +1,102 @@
+import numpy as np
+import sys
+import os
+# need file to be able to see the Game and Strategies folders to run it driectly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from Strategies.registry import create_strategy, supports_batch
+
+
+class BatchSimulationEngine:
+    """
+    plays many games at once for strategies without own state (Random, Greedy, ...).
+    All boards are stacked in one (games, N, N) integer array and every game advances by one
+    move per loop iteration, so one iteration costs a few NumPy operations on all games instead
+    of a Python move() call per game.
+
+    A strategy takes part if it has a `batch_move(legal, cand_values, rng)` method. The candidates of a
+    game are all N*N cells on the first move, afterwards the 2N-1 cells of the last move's row and column.
+    Both are in row-major order, so "the first legal candidate" is the same cell as in a scan of the board.
+    """
+    def __init__(self, strategy1, strategy2, boards, rng=None):
+        """
+        boards: (games, N, N) array (or list of NxN boards), every board is played once with strategy1 as P1
+        rng: numpy random Generator for the random strategies (None -> new unseeded one)
+        """
+        self.strategies =[strategy1, strategy2]
+        for strategy in self.strategies:
+            if not hasattr(strategy, "batch_move"):
+                raise ValueError(f"{type(strategy).__name__} can't play in the batch engine (no batch_move)")
+        self.values =np.array(boards, dtype=np.int64)
+        if self.values.ndim !=3 or self.values.shape[1] !=self.values.shape[2]:
+            raise ValueError("Boards must have shape (games, N, N).")
+        self.rng =rng if rng is not None else np.random.default_rng()
+
+    def run_games(self):
+        """
+        plays all games to the end and returns one result dict per board, like SimulationEngine.run_game:
+        {"p1_score", "p2_score", "winner"}
+        """
+        n_games, n, _ =self.values.shape
+        if n_games ==0:
+            return []
+        #boards and free cells as (games, N*N), cell (r, c) is column r*N+c
+        values =self.values.reshape(n_games, n*n)
+        free =np.ones(values.shape, dtype=bool)
+        scores =np.zeros((n_games, 2), dtype=np.int64)
+
+        #candidates after a move in cell r0*N+c0, in row-major order: the column cells above row r0,
+        #the whole row r0, then the column cells below it (the cell itself is listed once)
+        cand_cells =np.array([[i*n+c0 for i in range(r0)]+[r0*n+j for j in range(n)]+[i*n+c0 for i in range(r0+1, n)]
+                              for r0 in range(n) for c0 in range(n)])
+
+        #first move: every cell is a candidate
+        games =np.arange(n_games)
+        last =self.strategies[0].batch_move(free.copy(), values, self.rng)
+        free[games, last] =False
+        scores[:, 0] +=values[games, last]
+        player =1
+
+        #games that still have a legal move (finished games are dropped from the arrays)
+        while len(games):
+            cand =cand_cells[last]
+            legal =free[games[:, None], cand]
+            running =legal.any(axis=1)
+            if not running.all():
+                games, cand, legal =games[running], cand[running], legal[running]
+                if not len(games):
+                    break
+
+            choice =self.strategies[player].batch_move(legal, values[games[:, None], cand], self.rng)
+            last =cand[np.arange(len(games)), choice]
+            free[games, last] =False
+            scores[games, player] +=values[games, last]
+            player =1-player
+
+        results =[]
+        for p1_score, p2_score in scores.tolist():
+            winner ="Tie"
+            if p1_score> p2_score:
+                winner ="P1"
+            elif p2_score> p1_score:
+                winner ="P2"
+            results.append({"p1_score": p1_score, "p2_score": p2_score, "winner": winner})
+        return results
+
+
+def batch_play_boards(P1_strat, P2_strat, boards, seed=None):
+    """
+    batch version of SimulationHandler.play_board for a whole set of boards: both games of every board
+    (S1 starts in game 1, S2 in game 2). Returns [(game 1, game 2)] per board, which can be passed to
+    SimulationRunner.run_match as board_results.
+    """
+    for name in (P1_strat, P2_strat):
+        if not supports_batch(name):
+            raise ValueError(f"{name} can't play in the batch engine (see registry.BATCH_STRATEGIES)")
+    rng =np.random.default_rng(seed)
+    s1, s2 =create_strategy(P1_strat), create_strategy(P2_strat)
+    games1 =BatchSimulationEngine(s1, s2, boards, rng).run_games()
+    games2 =BatchSimulationEngine(s2, s1, boards, rng).run_games()
+    return list(zip(games1, games2))
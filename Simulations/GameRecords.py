@@ -0,0 +1,149 @@
+import json
+import os
+import numpy as np
+
+#one row per game; the moves of all games of a batch are stored in one separate array
+GAME_DTYPE = np.dtype([("board_size", "u2"), ("board_id", "i4"), ("p1", "S16"), ("p2", "S16"),
+                       ("p1_score", "i4"), ("p2_score", "i4"), ("n_moves", "u4")])
+#largest board size GAME_DTYPE can store (its cell indices row*N+col still fit into uint32)
+MAX_BOARD_SIZE = np.iinfo(np.uint16).max
+
+
+class GameRecordWriter:
+    """
+    streams compact game records (board id, strategies in seat order, moves, final scores) to a binary file.
+
+    The file is a sequence of NumPy arrays written with np.save:
+    - a header: JSON string with metadata (e.g. the run's seed), only at the start of a new file
+    - per batch: a GAME_DTYPE array with one row per game, followed by an array with the moves of all
+      these games one after another, every move as the cell index row*N+col (uint16, or uint32 for
+      batches with boards larger than 256x256)
+
+    Games are collected in memory and written every `batch_size` games (and on close), so memory stays bounded.
+    A 9x9 game takes about 60 bytes plus 2 bytes per move.
+
+    An existing file is continued (a resumed run adds its games to it). A batch cut off when the previous
+    run was killed is removed first, so the new batches follow the last complete one.
+    """
+    def __init__(self, path, batch_size=1000, **metadata):
+        self.path =path
+        self.batch_size =batch_size
+        self.games_written =0
+        self.games_added =0       #games passed to add(), written or still buffered
+        self._games =[]
+        self._moves =[]
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        complete =_complete_length(path) if os.path.exists(path) else 0
+        self._file =open(path, "ab")
+        if complete< self._file.tell():
+            self._file.truncate(complete)
+        if complete ==0:
+            np.save(self._file, np.array(json.dumps(metadata)))
+
+    def add(self, board_id, board_size, p1, p2, moves, p1_score, p2_score):
+        """store one finished game; moves as list of (row, col) in the order they were played"""
+        if board_size> MAX_BOARD_SIZE:
+            raise ValueError(f"game records support boards up to {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE}, not {board_size}x{board_size}")
+        self._games.append((board_size, board_id, p1, p2, p1_score, p2_score, len(moves)))
+        self._moves.extend(r*board_size+c for r, c in moves)
+        self.games_added +=1
+        if len(self._games)>= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """write the collected games as one batch"""
+        if not self._games:
+            return
+        np.save(self._file, np.array(self._games, dtype=GAME_DTYPE))
+        move_dtype =np.uint16 if max(self._moves, default=0)<= np.iinfo(np.uint16).max else np.uint32
+        np.save(self._file, np.array(self._moves, dtype=move_dtype))
+        self._file.flush()
+        self.games_written +=len(self._games)
+        self._games =[]
+        self._moves =[]
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameRecordBuffer:
+    """
+    in-memory stand-in for a GameRecordWriter (same `add`), used in worker processes: the records
+    are sent back with the game results and written by the writer of the main process
+    """
+    def __init__(self):
+        self.records =[]
+
+    def add(self, board_id, board_size, p1, p2, moves, p1_score, p2_score):
+        self.records.append((board_id, board_size, p1, p2, list(moves), p1_score, p2_score))
+
+
+def read_metadata(path):
+    """metadata stored in the header of a record file"""
+    with open(path, "rb") as f:
+        return json.loads(str(np.load(f)))
+
+
+def read_game_records(path):
+    """
+    yields every game of a record file as dict (board_size, board_id, p1, p2, p1_score, p2_score, moves),
+    one batch at a time, with the moves as list of (row, col).
+    A batch cut off at the end of the file (run killed while writing it) is skipped; a damaged batch
+    in the middle of the file raises ValueError.
+    """
+    with open(path, "rb") as f:
+        size =os.fstat(f.fileno()).st_size
+        np.load(f)   #header
+        while True:
+            batch =_read_batch(f, size)
+            if batch is None:
+                return
+            games, moves =batch
+            start =0
+            for game in games:
+                n =int(game["board_size"])
+                end =start+int(game["n_moves"])
+                yield {"board_size": n, "board_id": int(game["board_id"]), "p1": game["p1"].decode(),
+                       "p2": game["p2"].decode(), "p1_score": int(game["p1_score"]), "p2_score": int(game["p2_score"]),
+                       "moves": [divmod(int(m), n) for m in moves[start:end]]}
+                start =end
+
+
+def _read_batch(f, size):
+    """
+    next (games, moves) batch of an open record file of `size` bytes, or None at the end of the file
+    or if the rest of the file is a batch that was cut off while it was written
+    """
+    start =f.tell()
+    try:
+        games =np.load(f)
+        moves =np.load(f)
+    except (EOFError, ValueError):
+        if f.tell()>= size:
+            return None   #cut off at the end of the file
+        raise ValueError(f"{f.name}: damaged game record batch at byte {start}")
+    if games.dtype.names is None or len(moves) !=int(games["n_moves"].sum()):
+        raise ValueError(f"{f.name}: damaged game record batch at byte {start}")
+    return games, moves
+
+
+def _complete_length(path):
+    """length of the file up to the end of its last complete batch (0 if not even the header is complete)"""
+    with open(path, "rb") as f:
+        size =os.fstat(f.fileno()).st_size
+        try:
+            np.load(f)
+        except (EOFError, ValueError):
+            return 0
+        end =f.tell()
+        while _read_batch(f, size) is not None:
+            end =f.tell()
+    return end
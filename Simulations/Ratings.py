@@ -0,0 +1,105 @@
+import math
+import numpy as np
+
+#rating scale: 400 points = 10:1 odds, like Elo
+ELO_SCALE =400/math.log(10)
+
+
+class RatingEngine:
+    """
+    online Bradley-Terry ratings of the strategies, overall and per board size.
+
+    Every game only updates win counts per (board size, strategy, opponent) (a tie counts half for both),
+    so adding results is O(1) and the engine can be fed while a tournament is running. The ratings are
+    fitted when they are asked for: maximum likelihood of the Bradley-Terry model
+        P(a beats b) = 1 / (1 + 10^((R_b - R_a)/400))
+    with a normal prior (sd `prior_sd` rating points around the mean 1500), which keeps ratings finite when
+    a strategy won or lost every game. The uncertainty `se` is the standard error from the curvature of the
+    log-likelihood at the optimum, for the rating relative to the mean of all ratings (only differences
+    between ratings are meaningful).
+    """
+    def __init__(self, prior_sd=400.0):
+        self.prior_sd =prior_sd
+        self.wins ={}          #board size -> {(winner, loser): wins}, ties as 0.5 for both
+        self._cache ={}        #board size (None = all) -> fitted table, dropped when new results arrive
+
+    def add_game(self, p1, p2, winner, board_size):
+        """one game result: p1/p2 strategy names in seat order, winner "P1", "P2" or "Tie" """
+        wins =self.wins.setdefault(board_size, {})
+        if winner =="P1":
+            wins[(p1, p2)] =wins.get((p1, p2), 0)+1
+        elif winner =="P2":
+            wins[(p2, p1)] =wins.get((p2, p1), 0)+1
+        else:
+            wins[(p1, p2)] =wins.get((p1, p2), 0)+0.5
+            wins[(p2, p1)] =wins.get((p2, p1), 0)+0.5
+        self._cache ={}
+
+    def add_board_results(self, board_size, S1, S2, board_results):
+        """the (game 1, game 2) results of run_match: S1 is P1 in game 1, S2 is P1 in game 2"""
+        for r1, r2 in board_results:
+            self.add_game(S1, S2, r1["winner"], board_size)
+            self.add_game(S2, S1, r2["winner"], board_size)
+
+    def ratings(self, board_size=None):
+        """
+        fitted ratings as list of dicts {"strategy", "rating", "se", "games"}, best first.
+        board_size=None uses the games of all sizes.
+        """
+        if board_size not in self._cache:
+            self._cache[board_size] =self._fit(board_size)
+        return self._cache[board_size]
+
+    def table(self, board_size=None):
+        """ratings as printable text"""
+        title ="all sizes" if board_size is None else f"{board_size}x{board_size}"
+        lines =[f"ratings ({title})"]
+        for row in self.ratings(board_size):
+            lines.append(f"  {row['strategy']:<12} {row['rating']:7.0f} +- {row['se']:4.0f}   ({row['games']} games)")
+        return "\n".join(lines)
+
+    def _fit(self, board_size):
+        #win counts of the requested size(s)
+        counts ={}
+        sizes =self.wins if board_size is None else {board_size: self.wins.get(board_size, {})}
+        for wins in sizes.values():
+            for pair, w in wins.items():
+                counts[pair] =counts.get(pair, 0)+w
+
+        names =sorted({name for pair in counts for name in pair})
+        if not names:
+            return []
+        index ={name: i for i, name in enumerate(names)}
+        k =len(names)
+        W =np.zeros((k, k))                  #W[i, j] = wins of i against j
+        for (a, b), w in counts.items():
+            W[index[a], index[b]] +=w
+        N =W+W.T                             #games between i and j
+        games =N.sum(axis=1)
+
+        #Newton's method on the penalized log-likelihood (concave -> converges in a few steps)
+        tau2 =(self.prior_sd/ELO_SCALE)**2
+        theta =np.zeros(k)
+        for _ in range(100):
+            P =1/(1+np.exp(theta[None, :]-theta[:, None]))   #P[i, j] = P(i beats j)
+            grad =W.sum(axis=1)-(N*P).sum(axis=1)-theta/tau2
+            C =N*P*(1-P)
+            hessian =C-np.diag(C.sum(axis=1)+1/tau2)
+            step =np.linalg.solve(hessian, grad)
+            theta -=step
+            if np.abs(step).max()< 1e-9:
+                break
+
+        P =1/(1+np.exp(theta[None, :]-theta[:, None]))
+        C =N*P*(1-P)
+        hessian =C-np.diag(C.sum(axis=1)+1/tau2)
+        covariance =np.linalg.inv(-hessian)
+        #only differences are identified -> uncertainty of every rating relative to the mean of all ratings
+        contrast =np.eye(k)-1/k
+        se =np.sqrt(np.einsum("ij,jk,ik->i", contrast, covariance, contrast))
+
+        #the scale has no absolute zero: center on 1500
+        rating =1500+ELO_SCALE*(theta-theta.mean())
+        rows =[{"strategy": name, "rating": float(rating[i]), "se": float(ELO_SCALE*se[i]),
+                "games": int(round(games[i]))} for i, name in enumerate(names)]
+        return sorted(rows, key=lambda row: row["rating"], reverse=True)
@@ -0,0 +1,221 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+import pandas as pd
+
+#columns of a run_match row, in the order of the result csv
+MATCHUP_COLUMNS = [
+    ("board_size", "INTEGER"), ("boards", "INTEGER"), ("games_per_board", "INTEGER"), ("total_games_matchup", "INTEGER"),
+    ("S1", "TEXT"), ("S2", "TEXT"),
+    ("S1_wins_as_P1", "INTEGER"), ("S1_wins_as_P2", "INTEGER"), ("S2_wins_as_P1", "INTEGER"), ("S2_wins_as_P2", "INTEGER"),
+    ("ties", "INTEGER"),
+    ("S1_win_rate_as_P1", "REAL"), ("S1_win_rate_as_P2", "REAL"), ("S2_win_rate_as_P1", "REAL"), ("S2_win_rate_as_P2", "REAL"),
+    ("S1_overall_win_rate", "REAL"), ("S2_overall_win_rate", "REAL"), ("total_tie_rate", "REAL"),
+    ("starter_win_rate", "REAL"), ("stop_reason", "TEXT"),
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    seed TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    {", ".join(f"{name} {sql_type}" for name, sql_type in MATCHUP_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS games (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    board_size INTEGER NOT NULL,
+    S1 TEXT NOT NULL,
+    S2 TEXT NOT NULL,
+    board_index INTEGER NOT NULL,
+    game INTEGER NOT NULL,
+    p1 TEXT NOT NULL,
+    p2 TEXT NOT NULL,
+    p1_score INTEGER NOT NULL,
+    p2_score INTEGER NOT NULL,
+    winner TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matchups_run ON matchups(run_id);
+CREATE INDEX IF NOT EXISTS matchups_size ON matchups(board_size);
+CREATE INDEX IF NOT EXISTS matchups_pair ON matchups(S1, S2);
+CREATE INDEX IF NOT EXISTS games_run ON games(run_id);
+CREATE INDEX IF NOT EXISTS games_size ON games(board_size);
+CREATE INDEX IF NOT EXISTS games_pair ON games(S1, S2);
+
+-- every match up seen from both strategies: one row with strategy = S1 and one with strategy = S2
+CREATE VIEW IF NOT EXISTS strategy_matchups AS
+    SELECT run_id, board_size, S1 AS strategy, S2 AS opponent, boards, total_games_matchup AS games,
+           S1_wins_as_P1 AS wins_as_P1, S1_wins_as_P2 AS wins_as_P2, S2_wins_as_P1+S2_wins_as_P2 AS losses, ties,
+           S1_overall_win_rate AS win_rate, starter_win_rate
+    FROM matchups
+    UNION ALL
+    SELECT run_id, board_size, S2, S1, boards, total_games_matchup,
+           S2_wins_as_P1, S2_wins_as_P2, S1_wins_as_P1+S1_wins_as_P2, ties,
+           S2_overall_win_rate, starter_win_rate
+    FROM matchups;
+"""
+
+
+class ResultsStore:
+    """
+    results of many simulation runs in one SQLite database (stdlib sqlite3, one file).
+
+    Tables:
+    - runs: one row per run (run_id, creation time, seed, configuration as JSON)
+    - matchups: the run_match rows (same columns as simulation_results2.csv) plus run_id
+    - games: every single game (board, seat order, scores, winner) plus run_id
+    Both result tables are indexed by run_id, board_size and the strategy pair (S1, S2). New runs are appended,
+    so the results of different runs can be compared with one query.
+
+    The aggregations of aggregate_per_strategy and of the statistics script are available as queries
+    (win_rates, outcome_rates, head_to_head, ...). They return pandas DataFrames and take `runs`: list of
+    run ids to use (None = all runs).
+    """
+    def __init__(self, path):
+        self.path =path
+        self.conn =sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    #----------------------------------- writing -----------------------------------
+
+    def add_run(self, seed=None, **config):
+        """registers a new run and returns its run_id"""
+        with self.conn:
+            cursor =self.conn.execute("INSERT INTO runs (created, seed, config) VALUES (?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"), None if seed is None else str(seed),
+                 json.dumps(config, default=str)))
+        return cursor.lastrowid
+
+    def add_matchups(self, run_id, rows):
+        """stores run_match rows (dicts) of a run; missing columns (e.g. stop_reason of old csvs) stay NULL"""
+        names =[name for name, _ in MATCHUP_COLUMNS]
+        sql =f"INSERT INTO matchups (run_id, {', '.join(names)}) VALUES ({', '.join('?'*(len(names)+1))})"
+        with self.conn:
+            self.conn.executemany(sql, ([run_id]+[_plain(row.get(name)) for name in names] for row in rows))
+
+    def add_games(self, run_id, board_size, S1, S2, board_results):
+        """
+        stores the (game 1, game 2) results of the boards of one match up, in board order:
+        S1 is P1 in game 1 and S2 is P1 in game 2 (like in run_match)
+        """
+        rows =[]
+        for i, (r1, r2) in enumerate(board_results):
+            rows.append((run_id, board_size, S1, S2, i, 1, S1, S2, r1["p1_score"], r1["p2_score"], r1["winner"]))
+            rows.append((run_id, board_size, S1, S2, i, 2, S2, S1, r2["p1_score"], r2["p2_score"], r2["winner"]))
+        with self.conn:
+            self.conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def import_csv(self, csv_path, seed=None, **config):
+        """appends an existing result csv (simulation_results2.csv) as a new run and returns its run_id"""
+        df =pd.read_csv(csv_path)
+        run_id =self.add_run(seed, source=csv_path, **config)
+        self.add_matchups(run_id, df.to_dict("records"))
+        return run_id
+
+    def delete_run(self, run_id):
+        with self.conn:
+            for table in ("games", "matchups", "runs"):
+                self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    #----------------------------------- queries -----------------------------------
+
+    def query(self, sql, params=()):
+        """any SQL query as DataFrame"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def runs(self):
+        return self.query("""SELECT r.run_id, r.created, r.seed, r.config, COUNT(m.run_id) AS matchups,
+                                    SUM(m.total_games_matchup) AS games
+                             FROM runs r LEFT JOIN matchups m ON m.run_id = r.run_id
+                             GROUP BY r.run_id ORDER BY r.run_id""")
+
+    def matchups(self, runs=None):
+        """the stored run_match rows (the content of simulation_results2.csv)"""
+        where, params =_run_filter(runs)
+        return self.query(f"SELECT * FROM matchups {where} ORDER BY run_id, rowid", params)
+
+    def aggregate_per_strategy(self, runs=None):
+        """per-strategy wins, games and win rates as P1 and as P2 across all opponents and sizes (like aggregate_per_strategy)"""
+        where, params =_run_filter(runs)
+        df =self.query(f"""SELECT strategy, SUM(wins_as_P1) AS wins_as_P1, SUM(boards) AS games_as_P1,
+                                  1.0*SUM(wins_as_P1)/SUM(boards) AS win_rate_as_P1,
+                                  SUM(wins_as_P2) AS wins_as_P2, SUM(boards) AS games_as_P2,
+                                  1.0*SUM(wins_as_P2)/SUM(boards) AS win_rate_as_P2
+                           FROM strategy_matchups {where}
+                           GROUP BY strategy ORDER BY win_rate_as_P1 DESC, win_rate_as_P2 DESC""", params)
+        return df.set_index("strategy")
+
+    def win_rates(self, runs=None, by_size=False, by_run=False):
+        """
+        wins, losses and win rate of the decisive games per strategy
+        (optionally per board size and/or per run, to compare runs)
+        """
+        keys =(["run_id"] if by_run else [])+["strategy"]+(["board_size"] if by_size else [])
+        where, params =_run_filter(runs)
+        return self.query(f"""SELECT {', '.join(keys)}, SUM(wins_as_P1+wins_as_P2) AS wins, SUM(losses) AS losses,
+                                     1.0*SUM(wins_as_P1+wins_as_P2)/NULLIF(SUM(wins_as_P1+wins_as_P2+losses), 0) AS win_rate
+                              FROM strategy_matchups {where}
+                              GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}""", params)
+
+    def outcome_rates(self, runs=None):
+        """win, tie and loss counts and proportions of all games per strategy"""
+        where, params =_run_filter(runs)
+        return self.query(f"""SELECT strategy, SUM(wins_as_P1+wins_as_P2) AS wins, SUM(ties) AS ties, SUM(losses) AS losses,
+                                     SUM(games) AS games,
+                                     1.0*SUM(wins_as_P1+wins_as_P2)/SUM(games) AS win_rate,
+                                     1.0*SUM(ties)/SUM(games) AS tie_rate,
+                                     1.0*SUM(losses)/SUM(games) AS loss_rate
+                              FROM strategy_matchups {where}
+                              GROUP BY strategy ORDER BY strategy""", params)
+
+    def head_to_head(self, runs=None, by_size=False):
+        """mean overall win rate of every strategy (A) against every opponent (B) over their match ups"""
+        keys =["strategy", "opponent"]+(["board_size"] if by_size else [])
+        where, params =_run_filter(runs)
+        return self.query(f"""SELECT strategy AS A, opponent AS B{', board_size' if by_size else ''}, AVG(win_rate) AS A_win_rate
+                              FROM strategy_matchups {where}
+                              GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}""", params)
+
+    def first_move_advantage(self, runs=None):
+        """starter win rate per strategy and board size, averaged over its match ups weighted by their games"""
+        where, params =_run_filter(runs)
+        return self.query(f"""SELECT strategy, board_size, SUM(starter_win_rate*games)/SUM(games) AS starter_win_rate,
+                                     SUM(games) AS total_games
+                              FROM strategy_matchups {where}
+                              GROUP BY strategy, board_size ORDER BY strategy, board_size""", params)
+
+    def consistency(self, runs=None):
+        """mean, standard deviation and coefficient of variation of each strategy's win rates over the board sizes"""
+        per_size =self.win_rates(runs, by_size=True)
+        summary =per_size.groupby("strategy")["win_rate"].agg(["mean", "std"]).reset_index()
+        summary["cv"] =summary["std"]/summary["mean"]
+        return summary
+
+
+def _run_filter(runs):
+    """WHERE clause (and parameters) restricting a query to the given run ids"""
+    if runs is None:
+        return "", ()
+    runs =list(runs)
+    return f"WHERE run_id IN ({', '.join('?'*len(runs))})", tuple(runs)
+
+
+def _plain(value):
+    """numpy scalars (pandas rows) -> Python values sqlite understands; NaN -> NULL"""
+    if hasattr(value, "item"):
+        value =value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
@@ -1,6 +1,9 @@
 import random
+import json
+import time
+import math
+from statistics import NormalDist
 import numpy as np
-import pandas as pd
 import sys
 import os
 # need file to be able to see the Game and Strategies folders to run it driectly
@@ -8,12 +11,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from Strategies.RandomStrategy import RandomStrategy
-from Strategies.GreedyStrategy import GreedyStrategy
-from Strategies.MCTS import MCTSStrategy
-from Strategies.safe_choice_strategy import SafeChoiceStrategy
-from Strategies.minimax_f import AlphaBetaStrategy
+from Strategies.registry import create_strategy, strategy_names
 from Game.Player import Player
+from Game.GameState import GameState
+from Game.BoardCorpus import BoardCorpus
+from Simulations.GameRecords import GameRecordWriter, GameRecordBuffer
+from Simulations.Ratings import RatingEngine
 
 #each random board is played twice to eliminate first-mover bias -> will have to swap roles
 games_per_board=2 
@@ -22,50 +25,33 @@ class SimulationEngine:
     """
     need a new class that can run an entire game from start to finish in memory, without opening any windows
     """
-    def __init__(self, player1, player2, board_matrix):
+    def __init__(self, player1, player2, board_matrix, instrument=False, recorder=None, board_id=-1):
         """
         initializes a new game 
+        instrument: record timing and search statistics of every move in `move_log`
+        recorder: GameRecordWriter (or anything with its `add`) that gets the finished game's moves,
+        stored under `board_id`
         """
         self.players =[player1, player2]       #store players in list
-        self.matrix =np.copy(board_matrix)     #create copy of the board to not modify original matrix
-        self.dim = len(self.matrix)             #store dim of board
-        self.score=[0, 0]                     #initialize score count
-        self.current_player=0                 #start game with player 1
-        self.last_move =None                   #no moves yet-> initializes last move made with None
+        self.state =GameState(board_matrix)    #own state (copies the board) -> original matrix is not modified
+        self.dim = self.state.n                #store dim of board
+        self.instrument =instrument
+        self.move_log =[]                      #one dict per move (only with instrument=True)
+        self.recorder =recorder
+        self.board_id =board_id
 
     def get_available_moves(self):
         """
         find all valid moves for the current player
         """
-        moves =[]
-        
-        #   first move-> everything is possible-> iterate over entire board and assure no move already taken
-        if self.last_move is None:
-            for r in range(self.dim):
-                for c in range(self.dim):
-                    if self.matrix[r][c] !="-": #check if cell is not taken
-                        moves.append((r, c))
-            return moves
-
-        #subsequent moves: limited to row or column of the last move
-        last_r, last_c =self.last_move
-
-        #same column
-        for r in range(self.dim):
-            #check if cell is not taken
-            if self.matrix[r][last_c] !="-": 
-                moves.append((r, last_c))
-        #same row (avoid double-adding intersection)
-        for c in range(self.dim):
-            if c !=last_c and self.matrix[last_r][c] !="-": #skip the intersection cell if already added from column check
-                moves.append((last_r, c))
-        
-        return moves
+        return self.state.legal_moves()
 
     def run_game(self):
         """
         run until no moves are left, return final score and winner
         """
+        state =self.state
+        engine_start =time.perf_counter()     #start of the engine's own work (instrumentation)
 
         while True:
             #find all moves based on current board
@@ -76,32 +62,31 @@ class SimulationEngine:
                 break
 
             #get current player
-            player =self.players[self.current_player]
+            player =self.players[state.current_player]
 
             #ask AI strategy to choose a move 
-            move =player.move(self.matrix, self.last_move, self.score) 
+            if self.instrument:
+                wall_start, cpu_start =time.perf_counter(), time.process_time()
+                engine =wall_start-engine_start
+                move =player.move(state)
+                wall, cpu =time.perf_counter()-wall_start, time.process_time()-cpu_start
+            else:
+                move =player.move(state) 
 
             #if move is non legal-> return VAlue Error
             if move not in available_moves:
-                raise ValueError(f"Non-available move by player {self.current_player}.")
-                        
-            #devide returned move in coordinates
-            row, col =move
-
-            #get value from chosen move and add to player's score
-            value = self.matrix[row][col]
-            self.score[self.current_player] +=value
-            
-            #mark cell as taken and store the move as last taken move
-            self.matrix[row][col] ="-" 
-            self.last_move =(row, col)
+                raise ValueError(f"Non-available move by player {state.current_player}.")
+
+            if self.instrument:
+                self._log_move(player, len(available_moves), wall, cpu, engine)
 
-            #switch players
-            self.current_player = 1-self.current_player 
+            #take the cell: adds value to player's score, marks cell as taken, stores last move and switches players
+            state.apply(move)
+            engine_start =time.perf_counter()
 
 
         #left loop-> can determine a winner
-        p1_score, p2_score = self.score
+        p1_score, p2_score = state.scores
         
         winner ="Tie"
         if p1_score> p2_score:
@@ -110,37 +95,112 @@ class SimulationEngine:
             winner ="P2"
             
         # return result in dic
-        return {"p1_score": p1_score, "p2_score": p2_score, "winner": winner}
+        result ={"p1_score": p1_score, "p2_score": p2_score, "winner": winner}
+        if self.recorder is not None:
+            self.recorder.add(self.board_id, self.dim, self.players[0].name, self.players[1].name,
+                              state.played_moves(), p1_score, p2_score)
+        if self.instrument:
+            result["moves"] =self.move_log
+        return result
+
+    def _log_move(self, player, branching, wall, cpu, engine):
+        """
+        record of one move: board size, move number, seat, strategy, number of legal moves,
+        wall and CPU time of the strategy call, engine time since the previous move (applying it,
+        finding the legal moves) and the strategy's own search statistics
+        """
+        stats =player.strategy.search_stats() if player.strategy is not None else {}
+        self.move_log.append({"board_size": self.dim, "move_number": self.state.moves_made+1,
+            "seat": f"P{self.state.current_player+1}", "strategy": player.name, "branching": branching,
+            "wall_time": wall, "cpu_time": cpu, "engine_time": engine,
+            "nodes": stats.get("nodes"), "iterations": stats.get("iterations"), "depth": stats.get("depth")})
     
 
-def create_random_board(size: int) -> np.ndarray:
+def create_random_board(size: int, rng=random) -> np.ndarray:
     """
-    geenerate random NxN board for the simulation
+    geenerate random NxN board for the simulation (rng: random.Random for reproducible boards)
     """
     #create list of lists for game 
-    matrix =[[random.randint(1, 9) for row in range(size)] for col in range(size)]
-    #convert to array with object type, so will be able to store '-' for used fields
-    return np.array(matrix, dtype=object) 
+    matrix =[[rng.randint(1, 9) for row in range(size)] for col in range(size)]
+    #compact integer array, taken cells are tracked by the GameState
+    return np.array(matrix, dtype=np.int64) 
+
+def task_seed(base_seed, board_dim, P1_strat, P2_strat, board_index):
+    """
+    seed for the games of one (size, S1, S2, board) unit, derived only from the unit itself ->
+    the same games are played no matter which worker plays them or in which order
+    """
+    return random.Random(f"{base_seed}-{board_dim}-{P1_strat}-{P2_strat}-{board_index}").getrandbits(64)
+
 
-def create_strategy(name: str):
+def play_board(P1_strat, P2_strat, board, seed=None, instrument=False, board_id=-1, record=False):
     """
-    match string names to the strategies
+    plays both games of one board (S1 starts in game 1, S2 in game 2) and returns the two results.
+    With a seed, the random generators are reset first, so the outcome only depends on the seed
+    (except for strategies with a wall-clock time limit like MCTS)
+    instrument: the results also contain the per-move records ("moves", see SimulationEngine)
+    record: the results also contain the game record ("record": arguments of GameRecordWriter.add)
     """
-    if name =="Random": return RandomStrategy()
-    if name =="Greedy": return GreedyStrategy()
-    if name == "SafeChoice": return SafeChoiceStrategy()
-    if name =="MCTS": return MCTSStrategy()
-    if name =="Minimax": return AlphaBetaStrategy()
-    raise ValueError(f"{name}-strategy not existent for game")
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed % 2**32)
+
+    recorder =GameRecordBuffer() if record else None
+
+    #Game 1: S1=P1 (-> is starter), S2=P2
+    #set up game with random board, creating player with their strategies
+    engine1 = SimulationEngine(Player(P1_strat, False, create_strategy(P1_strat)),Player(P2_strat, False, create_strategy(P2_strat)),np.copy(board), instrument, recorder, board_id)
+    #run game simulation to completion
+    r1 = engine1.run_game()
+
+    #Game 2: S2=P1, S1=P2
+    engine2 = SimulationEngine(Player(P2_strat, False, create_strategy(P2_strat)),Player(P1_strat, False, create_strategy(P1_strat)),np.copy(board), instrument, recorder, board_id)
+    r2 = engine2.run_game()
+
+    if record:
+        r1["record"], r2["record"] =recorder.records
+    return r1, r2
+
+
+def _play_board_task(task):
+    """worker entry point of the parallel mode: task = (P1_strat, P2_strat, board, seed, instrument, board_id, record)"""
+    return play_board(*task)
 
 
 class SimulationRunner:
-    def __init__(self, number_of_simulations=None, strategies=None, board_dims=None, boards_per_size=None): # New boards_per_size parameter
+    def __init__(self, number_of_simulations=None, strategies=None, board_dims=None, boards_per_size=None, # New boards_per_size parameter
+                 workers=1, seed=None, checkpoint=None, resume=False, instrument=False, corpus_dir=None,
+                 record_games=None, record_batch=1000, progress_every=None,
+                 stop_rule=None, min_boards=10, check_every=10, ci_half_width=0.03, confidence=0.97,
+                 sprt_delta=0.05, sprt_alpha=0.05, sprt_beta=0.05):
         """
         initialize one simulation run
+        workers: number of processes the games are distributed over (1 = play everything in this process)
+        seed: base seed for boards and games. Every (size, S1, S2, board) unit gets its own seed derived
+        from it, so the results don't depend on the number of workers (None = new random base seed)
+        checkpoint: path of a JSON-lines file every finished (size, S1, S2, board) unit is appended to
+        resume: continue the run stored in an existing checkpoint file (same seed, finished units are skipped)
+        instrument: record per-move timing and search statistics (see save_latency)
+        corpus_dir: folder with one binary board corpus per size (boards_NxN.npy, see Game/BoardCorpus.py).
+            Missing corpora are generated from the seed and saved; existing ones are memory-mapped and their
+            boards are used, so later runs (with the same seed) play exactly the same boards (see corpus_boards)
+        record_games: path of a binary file the moves of every game are streamed to (see GameRecords.py),
+            written in batches of record_batch games. Board ids are the board indices within their size
+        progress_every: print the current ratings (see `ratings`) after every this many finished boards
+        stop_rule: adaptive number of boards per match up (boards_per_size becomes the maximum):
+            None   -> every match up plays all boards
+            "ci"   -> stop once the Wilson interval (`confidence`) of both strategies' win rates is at most
+                      +-`ci_half_width` wide. At p=0.5 that takes n=(z/2h)^2 games: 1308 for +-3%, i.e. the whole
+                      run of 5 sizes; a single match up of 132 boards (264 games) only gets to about +-6.7%, so
+                      close match ups end at the maximum. The interval is recomputed at every check point
+                      without a correction for these repeated looks, so the coverage is only approximately
+                      `confidence` (an early stop is slightly more likely than the nominal level says)
+            "sprt" -> sequential probability ratio test on the decisive games, H0: S1 wins with p=0.5-delta,
+                      H1: p=0.5+delta (error rates sprt_alpha/sprt_beta) -> stop once one strategy is better
+            The rule is checked after every `check_every` boards, but not before `min_boards` boards
         """
         if strategies is None:
-            strategies =["Random", "Greedy", "SafeChoice", "MCTS", "Minimax"]
+            strategies =strategy_names()
         if board_dims is None:
             #decide for small medium and large games of even and odd row/col numbers
             board_dims =[3, 5, 6, 8, 9] 
@@ -155,12 +215,168 @@ class SimulationRunner:
         self.results =[]                              #initialize list with results (Win, Loss, Tie)
         self.board_dim= board_dims
         self.boards_per_size=boards_per_size         #store the new board counts per dimension
+        self.workers =workers
+        self.seed =seed if seed is not None else random.getrandbits(64)
+        self.checkpoint =checkpoint
+        self.resume =resume
+        self.instrument =instrument
+        self.corpus_dir =corpus_dir
+        self.record_games =record_games
+        self.record_batch =record_batch
+        self.progress_every =progress_every
+        #live Bradley-Terry ratings, updated with every finished board -> can be queried during the run
+        self.ratings =RatingEngine()
+        self.move_records =[]       #per-move records of all played games (instrument=True)
+        self.completed ={}          #(size, S1, S2, board index) -> (game 1, game 2) results of finished units
+        self._unrecorded =[]        #(games added to the record writer, checkpoint line) of units whose records are not written yet
+        if stop_rule not in (None, "ci", "sprt"):
+            raise ValueError(f"unknown stop_rule: {stop_rule}")
+        self.stop_rule =stop_rule
+        self.min_boards =min_boards
+        self.check_every =max(1, check_every)
+        self.ci_half_width =ci_half_width
+        self.z =NormalDist().inv_cdf(0.5+confidence/2)   #two-sided z-score (2.17 for 97%)
+        self.sprt_delta =sprt_delta
+        #SPRT bounds of the log-likelihood ratio (Wald)
+        self.sprt_upper =math.log((1-sprt_beta)/sprt_alpha)
+        self.sprt_lower =math.log(sprt_beta/(1-sprt_alpha))
+        if checkpoint is not None:
+            self._open_checkpoint(seed)
+
+    def _open_checkpoint(self, seed):
+        """
+        checkpoint file: first line {"seed": ...}, then one line per finished unit
+        {"size", "S1", "S2", "board", "games": [game 1, game 2]}. Lines are only appended, so a killed
+        run loses at most the line that was being written.
+        """
+        if os.path.exists(self.checkpoint) and os.path.getsize(self.checkpoint)> 0:
+            if not self.resume:
+                raise FileExistsError(f"checkpoint {self.checkpoint} already exists (use resume=True to continue it)")
+            with open(self.checkpoint) as f:
+                header =json.loads(f.readline())
+                if seed is not None and seed !=header["seed"]:
+                    raise ValueError(f"seed {seed} does not match the checkpoint's seed {header['seed']}")
+                #boards and games are derived from the seed -> continue with the checkpoint's seed
+                self.seed =header["seed"]
+                for line in f:
+                    try:
+                        unit =json.loads(line)
+                    except json.JSONDecodeError:
+                        break   #last line was cut off when the run was killed
+                    key =(unit["size"], unit["S1"], unit["S2"], unit["board"])
+                    self.completed[key] =tuple(unit["games"])
+                    self.ratings.add_board_results(unit["size"], unit["S1"], unit["S2"], [self.completed[key]])
+            #drop a cut-off last line, so new units start on a line of their own
+            self._rewrite_checkpoint()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint)), exist_ok=True)
+            with open(self.checkpoint, "w") as f:
+                f.write(json.dumps({"seed": self.seed})+"\n")
+
+    def _rewrite_checkpoint(self):
+        with open(self.checkpoint, "w") as f:
+            f.write(json.dumps({"seed": self.seed})+"\n")
+            for (size, s1, s2, i), games in self.completed.items():
+                f.write(json.dumps({"size": size, "S1": s1, "S2": s2, "board": i, "games": list(games)})+"\n")
+
+    def _record_unit(self, key, games, checkpoint_file, record_writer=None):
+        """
+        store a finished unit and append it to the checkpoint (game records go to the record file).
+        With game records, the checkpoint line is only written once the unit's records are on disk
+        (the record writer writes in batches), so a resumed run never skips a unit without records
+        """
+        for game in games:
+            record =game.pop("record", None)
+            if record is not None and record_writer is not None:
+                record_writer.add(*record)
+        self.completed[key] =games
+        size, s1, s2, _ =key
+        self.ratings.add_board_results(size, s1, s2, [games])
+        if self.progress_every and len(self.completed)% self.progress_every ==0:
+            print(f"{len(self.completed)} boards played")
+            print(self.ratings.table())
+        if checkpoint_file is not None:
+            size, s1, s2, i =key
+            line =json.dumps({"size": size, "S1": s1, "S2": s2, "board": i, "games": list(games)})+"\n"
+            if record_writer is None:
+                checkpoint_file.write(line)
+                checkpoint_file.flush()
+            else:
+                self._unrecorded.append((record_writer.games_added, line))
+                self._write_recorded(checkpoint_file, record_writer)
+
+    def _write_recorded(self, checkpoint_file, record_writer):
+        """append the checkpoint lines of the units whose game records were written to the record file"""
+        written =0
+        for games_needed, line in self._unrecorded:
+            if games_needed> record_writer.games_written:
+                break
+            checkpoint_file.write(line)
+            written +=1
+        if written:
+            checkpoint_file.flush()
+            del self._unrecorded[:written]
 
-    def run_match(self, board_dim, P1_strat, P2_strat, set_of_boards):
+    def _stop_test(self, board_results):
+        """
+        sequential test of the adaptive mode on the boards played so far: returns the stopping
+        reason ("ci_width", "sprt_s1_better", "sprt_s2_better") or None to keep playing
+        """
+        boards =len(board_results)
+        if self.stop_rule is None or boards< self.min_boards:
+            return None
+
+        #wins of S1 (P1 in game 1, P2 in game 2) and S2
+        s1_wins =sum((r1["winner"]=="P1")+(r2["winner"]=="P2") for r1, r2 in board_results)
+        s2_wins =sum((r1["winner"]=="P2")+(r2["winner"]=="P1") for r1, r2 in board_results)
+
+        if self.stop_rule =="ci":
+            #Wilson score interval of both overall win rates
+            n =boards*games_per_board
+            z =self.z
+            for wins in (s1_wins, s2_wins):
+                p =wins/n
+                half_width =z*math.sqrt(p*(1-p)/n+z*z/(4*n*n))/(1+z*z/n)
+                if half_width> self.ci_half_width:
+                    return None
+            return "ci_width"
+
+        #SPRT on the decisive games: log-likelihood ratio of p1=0.5+delta against p0=0.5-delta
+        p1, p0 =0.5+self.sprt_delta, 0.5-self.sprt_delta
+        llr =s1_wins*math.log(p1/p0)+s2_wins*math.log((1-p1)/(1-p0))
+        if llr>= self.sprt_upper:
+            return "sprt_s1_better"
+        if llr<= self.sprt_lower:
+            return "sprt_s2_better"
+        return None
+
+    def _stop_reason(self, board_results, max_boards):
+        """
+        why a match up ended after these boards. With all max_boards played the limit ended it (the stop
+        test is not evaluated there); before, the stop test met at the last check point
+        """
+        boards =len(board_results)
+        if self.stop_rule is None:
+            return "fixed"
+        if boards< max_boards and boards% self.check_every ==0:
+            reason =self._stop_test(board_results)
+            if reason is not None:
+                return reason
+        return "max_boards"
+
+    def run_match(self, board_dim, P1_strat, P2_strat, set_of_boards, board_results=None):
         """
         run one single match up of competing strategy pairs, but both of them get first mover advantage once-> check how performance
         is as 1. and 2. player. Returns raw counts for later aggregation.
+        board_results: already played (game 1, game 2) results per board (parallel mode), otherwise the games are played here
+        (in the adaptive mode only until the stop rule is met)
         """
+        if board_results is None:
+            board_results =[]
+            for i, board in enumerate(set_of_boards):
+                board_results.append(play_board(P1_strat, P2_strat, board, task_seed(self.seed, board_dim, P1_strat, P2_strat, i)))
+                if len(board_results)% self.check_every ==0 and self._stop_test(board_results) is not None:
+                    break
         
         #raw counts for S1 and S2
         S1_wins_as_P1 =S1_wins_as_P2 = 0
@@ -169,15 +385,9 @@ class SimulationRunner:
         #track first-mover advantage
         starter_wins = 0 
 
-        #iterate through generated boards, so that the strategies can play the exact same boards twice 
-        for board in set_of_boards:
+        #the strategies played the exact same boards twice 
+        for r1, r2 in board_results:
             #Game 1: S1=P1 (-> is starter), S2=P2
-            #set up game with random board, creating player with their strategies
-            engine1 = SimulationEngine(Player(P1_strat, False, create_strategy(P1_strat)),Player(P2_strat, False, create_strategy(P2_strat)),np.copy(board))
-            
-            #run game simulation to completion
-            r1 = engine1.run_game()
-        
             if r1["winner"] =="P1":        #S1 wins as P1
                 S1_wins_as_P1 +=1
                 starter_wins +=1
@@ -187,9 +397,6 @@ class SimulationRunner:
                 ties += 1
 
             #Game 2: S2=P1, S1=P2
-            engine2 = SimulationEngine(Player(P2_strat, False, create_strategy(P2_strat)),Player(P1_strat, False, create_strategy(P1_strat)),np.copy(board) )
-            r2 = engine2.run_game()
-
             if r2["winner"]== "P1":        #S2 wins as P1
                 S2_wins_as_P1 +=1
                 starter_wins +=1
@@ -198,8 +405,8 @@ class SimulationRunner:
             else:
                 ties +=1
         
-        #calculate rates for printing and data storage
-        boards = len(set_of_boards)
+        #calculate rates for printing and data storage (only the boards actually played count)
+        boards = len(board_results)
         total_games = boards*games_per_board
         non_ties =max(1, total_games - ties)       #         avoid division by zero if all games were ties
 
@@ -229,10 +436,39 @@ class SimulationRunner:
 
             #overalls + meta
             "S1_overall_win_rate": S1_overall, "S2_overall_win_rate": S2_overall, "total_tie_rate": tie_rate,
-            "starter_win_rate": starter_win_rate
+            "starter_win_rate": starter_win_rate,
+
+            #why the match up ended: "fixed" (all boards), or in the adaptive mode the stop rule / "max_boards"
+            "stop_reason": self._stop_reason(board_results, len(set_of_boards))
         }
 
 
+    def corpus_boards(self, size, n_boards):
+        """
+        first n_boards boards of the size's corpus in corpus_dir (memory-mapped); the corpus is generated
+        from the runner's seed if it doesn't exist yet. An existing corpus must fit the run: one generated
+        from another seed raises a ValueError (its boards are not the ones of this seed), one generated from
+        this seed with too few boards is generated again with n_boards (the first boards stay the same).
+        A corpus built from existing boards (no seed in its metadata) is used as it is
+        """
+        path =os.path.join(self.corpus_dir, f"boards_{size}x{size}.npy")
+        if os.path.exists(path):
+            corpus =BoardCorpus(path)
+            if corpus.seed is not None and corpus.seed !=self.seed:
+                raise ValueError(f"corpus {path} was generated with seed {corpus.seed}, but the run uses seed {self.seed} "
+                                 f"(pass seed={corpus.seed} to play its boards, or use another corpus_dir)")
+            if corpus.seed is not None and len(corpus)< n_boards:
+                corpus =None    #release the memory map before the file is written again
+                corpus =BoardCorpus.generate(path, size, n_boards, self.seed)
+        else:
+            corpus =BoardCorpus.generate(path, size, n_boards, self.seed)
+
+        if corpus.size !=size:
+            raise ValueError(f"corpus {path} contains {corpus.size}x{corpus.size} boards, expected {size}x{size}")
+        if len(corpus)< n_boards:
+            raise ValueError(f"corpus {path} has only {len(corpus)} boards, {n_boards} are needed")
+        return corpus.boards[:n_boards]
+
     def run_iteration(self):
         """
         iterate through board dimensions and strategies
@@ -242,12 +478,18 @@ class SimulationRunner:
         if missing:
             raise KeyError(f"missing boards_per_size entries for sizes: {missing}")
         
+        #all (size, S1, S2) match ups with the boards they are played on
+        matchups =[]
         for size in self.board_dim:
             #use the determined number of boards for the size
             n_boards = self.boards_per_size[size] 
             
-            #generate all boards per size to ensure fair match ups
-            boards_set = [create_random_board(size) for _ in range(n_boards)] 
+            #generate all boards per size to ensure fair match ups (same boards for every seed and worker count)
+            if self.corpus_dir is not None:
+                boards_set =self.corpus_boards(size, n_boards)
+            else:
+                board_rng =random.Random(f"{self.seed}-boards-{size}")
+                boards_set = [create_random_board(size, board_rng) for _ in range(n_boards)] 
 
             #iterate through strategies, while avoiding duplicate pairs (A,B) and (B,A)
             for index1, s1 in enumerate(self.strategies):
@@ -255,17 +497,90 @@ class SimulationRunner:
                     #avoid duplication
                     if index1>=index2:
                         continue
-                    
-                    #run the games on fixed boards for fairness
-                    data =self.run_match(size, s1, s2, boards_set)
-                    #append the generated results to the result list
-                    if data:
-                        self.results.append(data)
+                    matchups.append((size, s1, s2, boards_set))
+
+        #boards are played in rounds: all boards at once, or in the adaptive mode `check_every` more boards of
+        #every match up that has not met its stop rule yet (decisions only depend on the results, not on timing)
+        played_boards =[0]*len(matchups)
+        active =list(range(len(matchups)))
+        chunk =self.check_every if self.stop_rule is not None else max(len(m[3]) for m in matchups)
+
+        pool =None
+        if self.workers> 1:
+            from concurrent.futures import ProcessPoolExecutor   #only needed with several workers
+            pool =ProcessPoolExecutor(max_workers=self.workers)
+        checkpoint_file =open(self.checkpoint, "a") if self.checkpoint is not None else None
+        record_writer =None
+        if self.record_games is not None:
+            record_writer =GameRecordWriter(self.record_games, self.record_batch, seed=self.seed, corpus_dir=self.corpus_dir)
+        try:
+            while active:
+                #every (size, S1, S2, board) unit of this round that is not finished yet (on resume, the checkpoint has the others)
+                pending =[]
+                for m in active:
+                    size, s1, s2, boards_set =matchups[m]
+                    end =min(played_boards[m]+chunk, len(boards_set))
+                    for i in range(played_boards[m], end):
+                        key =(size, s1, s2, i)
+                        if key not in self.completed:
+                            pending.append((key, (s1, s2, boards_set[i], task_seed(self.seed, size, s1, s2, i), self.instrument,
+                                                  i, record_writer is not None)))
+                    played_boards[m] =end
+
+                for key, games in self._play_units(pending, pool):
+                    self._record_unit(key, games, checkpoint_file, record_writer)
+
+                #match ups that played all their boards or met the stop rule are done
+                still_active =[]
+                for m in active:
+                    size, s1, s2, boards_set =matchups[m]
+                    if played_boards[m]< len(boards_set):
+                        played =[self.completed[(size, s1, s2, i)] for i in range(played_boards[m])]
+                        if self._stop_test(played) is None:
+                            still_active.append(m)
+                active =still_active
+        finally:
+            #records first: then the checkpoint lines of all their units can be written
+            if record_writer is not None:
+                record_writer.close()
+            if checkpoint_file is not None:
+                if record_writer is not None:
+                    self._write_recorded(checkpoint_file, record_writer)
+                checkpoint_file.close()
+            if pool is not None:
+                pool.shutdown()
+
+        for m, (size, s1, s2, boards_set) in enumerate(matchups):
+            played =[self.completed[(size, s1, s2, i)] for i in range(played_boards[m])]
+            for games in played:
+                for game in games:
+                    self.move_records.extend(game.get("moves", []))
+            #run the games on fixed boards for fairness
+            data =self.run_match(size, s1, s2, boards_set, played)
+            #append the generated results to the result list
+            if data:
+                self.results.append(data)
+
+    def _play_units(self, pending, pool=None):
+        """
+        plays the pending units and yields (key, (game 1, game 2)) as soon as each one is finished:
+        in this process, or in the process pool (one task per board)
+        """
+        if pool is None:
+            for key, task in pending:
+                yield key, _play_board_task(task)
+            return
+
+        futures ={pool.submit(_play_board_task, task): key for key, task in pending}
+        from concurrent.futures import as_completed
+        for future in as_completed(futures):
+            yield futures[future], future.result()
     
     def save_results(self, filename="simulation_results2.csv"): 
         """
         saves the simulation results as csv and exports
         """
+        import pandas as pd   #only needed for saving: workers and imports of this module don't load it
         df =pd.DataFrame(self.results)
         #define directory to save in 'results' subfolder
         out_dir =os.path.join(current_dir, "results") 
@@ -275,8 +590,48 @@ class SimulationRunner:
         df.to_csv(csv_path, index=False)
         return csv_path
 
+    def save_database(self, filename="results.db"):
+        """
+        appends this run to the SQLite results database (see ResultsStore.py): the run's seed and settings,
+        the match up rows and every single game. Returns the run_id of the run in the database
+        """
+        from Simulations.ResultsStore import ResultsStore
+        out_dir =os.path.join(current_dir, "results")
+        os.makedirs(out_dir, exist_ok=True)
+        with ResultsStore(os.path.join(out_dir, filename)) as store:
+            run_id =store.add_run(self.seed, strategies=self.strategies, board_dims=self.board_dim,
+                                  boards_per_size=self.boards_per_size, stop_rule=self.stop_rule)
+            store.add_matchups(run_id, self.results)
+            for row in self.results:
+                size, s1, s2 =row["board_size"], row["S1"], row["S2"]
+                store.add_games(run_id, size, s1, s2, [self.completed[(size, s1, s2, i)] for i in range(row["boards"])])
+        return run_id
+
+    def save_latency(self, filename="move_latency.csv"):
+        """
+        saves per-strategy and per-board-size move latency percentiles (wall time in seconds), mean CPU
+        time, branching factor and search statistics of an instrumented run next to the results csv
+        """
+        import pandas as pd
+        df =pd.DataFrame(self.move_records)
+        grouped =df.groupby(["strategy", "board_size"])
+        wall =grouped["wall_time"]
+        summary =pd.DataFrame({"moves": grouped.size(), "wall_mean": wall.mean(),
+            "wall_p50": wall.quantile(0.5), "wall_p90": wall.quantile(0.9), "wall_p99": wall.quantile(0.99),
+            "wall_max": wall.max(), "cpu_mean": grouped["cpu_time"].mean(), "engine_mean": grouped["engine_time"].mean(),
+            "branching_mean": grouped["branching"].mean(),
+            "nodes_mean": grouped["nodes"].mean(), "iterations_mean": grouped["iterations"].mean(),
+            "depth_mean": grouped["depth"].mean()})
+
+        out_dir =os.path.join(current_dir, "results") 
+        os.makedirs(out_dir, exist_ok=True)
+        out_path =os.path.join(out_dir, filename)
+        summary.to_csv(out_path, index=True)
+        return out_path
+
 def aggregate_per_strategy(csv_path: str, out_name="strategy_summary.csv"):
     """Aggregate overall per-strategy win rates as P1 and as P2 across all opponents & sizes."""
+    import pandas as pd
     df =pd.read_csv(csv_path)
 
     #wins when the strategy appears as S1 (P1/P2) + when it appears as S2 (P1/P2)
@@ -313,13 +668,29 @@ if __name__ =="__main__":
     #each board is played 2 times (->games_per_board=2), so total boards needed: $1308 / 2 = 654$
     #distributed evenly over 5 board sizes: $654 / 5 = 130.8$
     #set boards_per_size to 132 for each size to be safe.
+    import argparse
+    parser =argparse.ArgumentParser(description="Tournament of all strategies on all board sizes.")
+    parser.add_argument("--instrument", action="store_true",
+                        help="record per-move timings (results/move_latency.csv); keeps every move in memory and in the checkpoint")
+    args =parser.parse_args()
     
     runner = SimulationRunner(
         strategies=["Random", "Greedy", "SafeChoice", "MCTS", "Minimax"],
         board_dims=[3, 5, 6, 8, 9],
-        boards_per_size = {3: 132, 5: 132, 6: 132, 8: 132, 9: 132} #set based on 97% CI calculation
+        boards_per_size = {3: 132, 5: 132, 6: 132, 8: 132, 9: 132}, #set based on 97% CI calculation
+        workers=os.cpu_count() or 1,    #play the boards on all cores
+        #every finished board is appended to the checkpoint -> a killed run continues where it stopped
+        checkpoint=os.path.join(current_dir, "results", "checkpoint.jsonl"),
+        resume=True,
+        instrument=args.instrument     #per-move timings -> results/move_latency.csv (opt-in)
     )
     runner.run_iteration()
     results_csv = runner.save_results()
+    #all runs are collected in one database -> results/results.db
+    runner.save_database()
+    if args.instrument:
+        runner.save_latency()
+    #run is complete -> the next start begins a new tournament
+    os.remove(runner.checkpoint)
     #aggregate overall results per strategy for a final summary
     aggregate_per_strategy(results_csv)
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")   #no windows: figures are only written to files (also works in worker processes)
+import matplotlib.pyplot as plt
+import seaborn as sns
+import sys
+# need file to be able to see the Simulations folder to run it directly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from Simulations.ResultsStore import ResultsStore
+
+DEFAULT_RESULTS = os.path.join(current_dir, "Results", "simulation_results2.csv")
+DEFAULT_OUTPUT = os.path.join(current_dir, "Statistical Conclusions")
+
+#columns of the result csv the report needs (everything else is not loaded)
+USED_COLUMNS = ["board_size", "S1", "S2", "S1_wins_as_P1", "S1_wins_as_P2", "S2_wins_as_P1", "S2_wins_as_P2", "ties",
+                "total_games_matchup", "S1_overall_win_rate", "S2_overall_win_rate", "starter_win_rate"]
+
+#increase when compute_aggregates changes -> cached aggregates are computed again
+COMPUTE_VERSION = 1
+#increase when a plot function changes -> all figures are rendered again
+RENDER_VERSION = 1
+
+
+def load_results(path=DEFAULT_RESULTS, runs=None):
+    """
+    the match up rows the report is computed from: a result csv (simulation_results2.csv) or a
+    results database (.db, see ResultsStore.py, optionally only the run ids in `runs`)
+    """
+    if path.endswith(".db"):
+        with ResultsStore(path) as store:
+            return store.matchups(runs)[USED_COLUMNS]
+    return pd.read_csv(path, usecols=USED_COLUMNS)
+
+
+def compute_aggregates(csv):
+    """
+    computes every table of the report from the match up rows in one pass.
+    Every match up is turned into two rows, one from the view of each strategy (strategy, opponent); these
+    are summed once per (strategy, opponent, board size) into `base`, and all tables are sums/ratios of
+    `base`, which is tiny compared to the results. Returns a dict of DataFrames.
+    """
+    #both orientations of every match up (A = strategy, B = opponent)
+    long =pd.concat([
+        pd.DataFrame({"strategy": csv["S1"], "opponent": csv["S2"], "board_size": csv["board_size"],
+                      "wins": csv["S1_wins_as_P1"]+csv["S1_wins_as_P2"], "losses": csv["S2_wins_as_P1"]+csv["S2_wins_as_P2"],
+                      "ties": csv["ties"], "games": csv["total_games_matchup"], "rate": csv["S1_overall_win_rate"],
+                      "starter": csv["starter_win_rate"]*csv["total_games_matchup"]}),
+        pd.DataFrame({"strategy": csv["S2"], "opponent": csv["S1"], "board_size": csv["board_size"],
+                      "wins": csv["S2_wins_as_P1"]+csv["S2_wins_as_P2"], "losses": csv["S1_wins_as_P1"]+csv["S1_wins_as_P2"],
+                      "ties": csv["ties"], "games": csv["total_games_matchup"], "rate": csv["S2_overall_win_rate"],
+                      "starter": csv["starter_win_rate"]*csv["total_games_matchup"]}),
+    ], ignore_index=True)
+
+    #the only pass over all rows: sums per strategy, opponent and size (rate_sum/matchups -> mean win rate of the match ups)
+    base =long.groupby(["strategy", "opponent", "board_size"], as_index=False).agg(
+        wins=("wins", "sum"), losses=("losses", "sum"), ties=("ties", "sum"), games=("games", "sum"),
+        rate_sum=("rate", "sum"), matchups=("rate", "size"), starter=("starter", "sum"))
+
+    tables ={"base": base}
+
+    #win rate per strategy (decisive games) and win/tie/loss proportions of all games
+    per_strategy =base.groupby("strategy")[["wins", "losses", "ties", "games"]].sum()
+    decisive =per_strategy["wins"]+per_strategy["losses"]
+    tables["win_rates"] =pd.DataFrame({"strategy": per_strategy.index, "wins": per_strategy["wins"].values,
+        "losses": per_strategy["losses"].values,
+        "win_rate": (per_strategy["wins"]/decisive.where(decisive> 0)).values}).sort_values("win_rate", ascending=False)
+    total =per_strategy["wins"]+per_strategy["ties"]+per_strategy["losses"]
+    tables["outcomes"] =pd.DataFrame({"win_rate": per_strategy["wins"]/total, "tie_rate": per_strategy["ties"]/total,
+                                      "loss_rate": per_strategy["losses"]/total})
+
+    #head to head: mean win rate of A against B over their match ups, overall and per board size
+    pair =base.groupby(["strategy", "opponent"])[["rate_sum", "matchups"]].sum()
+    h2h =(pair["rate_sum"]/pair["matchups"]).unstack()
+    tables["head_to_head"] =h2h.rename_axis(index="A", columns="B").sort_index(axis=0).sort_index(axis=1)
+    mega =base.assign(B=base["opponent"]+"_"+base["board_size"].astype(str), A_win_rate=base["rate_sum"]/base["matchups"])
+    tables["head_to_head_by_size"] =mega.set_index(["strategy", "B"])["A_win_rate"].unstack().rename_axis(index="A")
+
+    #win rate per strategy and board size, and how much it varies over the sizes
+    per_size =base.groupby(["strategy", "board_size"], as_index=False)[["wins", "losses", "games", "starter"]].sum()
+    decisive =per_size["wins"]+per_size["losses"]
+    win_rates_by_size =pd.DataFrame({"strategy": per_size["strategy"], "board_size": per_size["board_size"],
+                                     "win_rate": per_size["wins"]/decisive.where(decisive> 0)})
+    tables["win_rates_by_size"] =win_rates_by_size
+    consistency =win_rates_by_size.groupby("strategy")["win_rate"].agg(["mean", "std"]).reset_index()
+    consistency["cv"] =consistency["std"]/consistency["mean"]
+    tables["consistency"] =consistency
+
+    #tie rate of all games per strategy
+    tables["ties"] =pd.DataFrame({"strategy": per_strategy.index, "ties": per_strategy["ties"].astype(int).values,
+        "total_games": per_strategy["games"].astype(int).values,
+        "tie_rate": (per_strategy["ties"]/per_strategy["games"].where(per_strategy["games"]> 0)).values}
+        ).sort_values("tie_rate", ascending=False)
+
+    #first move advantage: starter win rate of the strategy's match ups, weighted by their games
+    first_move =pd.DataFrame({"strategy": per_size["strategy"], "board_size": per_size["board_size"],
+                              "starter_win_rate": per_size["starter"]/per_size["games"], "total_games": per_size["games"]})
+    tables["first_move"] =first_move.sort_values(["strategy", "board_size"]).reset_index(drop=True)
+    tables["first_move_matrix"] =first_move.pivot(index="strategy", columns="board_size", values="starter_win_rate")
+
+    #overview of all strategies
+    overview =consistency.rename(columns={"cv": "CV"})
+    overview =overview.merge(first_move.groupby("strategy")["starter_win_rate"].mean().rename("Starter Win").reset_index(), on="strategy")
+    overview =overview.merge(tables["ties"][["strategy", "tie_rate"]].rename(columns={"tie_rate": "Tie %"}), on="strategy", how="left")
+    overview["Efficiency"] =overview["mean"]*overview["Starter Win"]
+    overview =overview.rename(columns={"strategy": "Strategy", "mean": "Mean Win Rate", "std": "Std"})
+    tables["overview"] =overview[["Strategy", "Mean Win Rate", "Std", "CV", "Starter Win", "Efficiency", "Tie %"]]
+
+    #relative advantage: win rate compared to the mean win rate of all other strategies
+    win_data =tables["win_rates"][["strategy", "win_rate"]].rename(columns={"strategy": "Strategy", "win_rate": "WinRate"}).reset_index(drop=True)
+    mean_others =(win_data["WinRate"].sum()-win_data["WinRate"])/(len(win_data)-1)
+    win_data["RelativeAdv"] =(win_data["WinRate"]-mean_others)/mean_others
+    win_data["RelativeAdv_%"] =100*win_data["RelativeAdv"]
+    tables["relative_advantage"] =win_data.sort_values("RelativeAdv", ascending=False).reset_index(drop=True)
+    return tables
+
+
+def print_tables(tables):
+    """prints the tables of the report"""
+    sections =[
+        ("Win Rate per Strategy", tables["win_rates"]),
+        ("Win rate of each strategy against another", tables["head_to_head"].round(3)),
+        ("Win rates of Strategies relatively to board size", tables["win_rates_by_size"]),
+        ("Consistency of strategies against board size", tables["consistency"]),
+        ("Tie rate", tables["ties"]),
+        ("First move advantage", tables["first_move"]),
+        ("Table Overview", tables["overview"].round(3)),
+        ("Relative Advantage per Strategy", tables["relative_advantage"].round({"WinRate": 3, "RelativeAdv": 3, "RelativeAdv_%": 1})),
+    ]
+    for title, table in sections:
+        print(f"\n\033[1m      {title} \033[0m")
+        print(table)
+
+
+#----------------------------------- figures -----------------------------------
+#every plot function gets its table and the output path; they run in worker processes
+
+def plot_head_to_head(matrix, path):
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(matrix, annot=True, cmap="coolwarm", vmin=0, vmax=1)
+    plt.title("Strategy vs Strategy Win Rates")
+    plt.xlabel("Opponent")
+    plt.ylabel("Strategy")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+
+
+def plot_outcomes(agg, path):
+    fig, ax =plt.subplots(figsize=(8, 5))
+    bottom =np.zeros(len(agg))
+    for col, color in zip(["win_rate", "tie_rate", "loss_rate"], ["#4caf50", "#ffb300", "#e53935"]):
+        ax.bar(agg.index, agg[col], bottom=bottom, label=col.split("_")[0].capitalize(), color=color)
+        bottom +=agg[col].values
+    ax.set_ylim(0, 1)
+    ax.set_title("Aggregate Win / Tie / Loss Rates per Strategy")
+    ax.set_ylabel("Proportion of Outcomes")
+    ax.legend()
+    plt.tight_layout()
+    fig.savefig(path)
+    plt.close("all")
+
+
+def plot_head_to_head_by_size(matrix, path):
+    plt.figure(figsize=(16, 6))
+    ax =sns.heatmap(matrix, annot=True, fmt=".1%", cmap="coolwarm", vmin=0, vmax=1, cbar=True, annot_kws={"rotation": 90, "va": "center"})
+    ax.set_title("Strategy vs (Opponent × Board Size) Win Rates")
+    ax.set_xlabel("Opponent × Board Size")
+    ax.set_ylabel("Strategy")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+
+
+def plot_win_rates_by_size(win_rates, path):
+    plt.figure(figsize=(8, 5))
+    sns.lineplot(data=win_rates, x="board_size", y="win_rate", hue="strategy", marker="o")
+    plt.title("Win Rate per Strategy across Board Sizes")
+    plt.xlabel("Board Size")
+    plt.ylabel("Win Rate")
+    plt.ylim(0, 1)
+    plt.legend(title="Strategy")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+
+
+def plot_first_move(first_move, path):
+    plt.figure(figsize=(8, 5))
+    sns.lineplot(data=first_move, x="board_size", y="starter_win_rate", hue="strategy", marker="o")
+    plt.title("First-Move Advantage per Strategy across Board Sizes")
+    plt.xlabel("Board Size")
+    plt.ylabel("Starter Win Rate")
+    plt.ylim(0, 1)
+    plt.legend(title="Strategy")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+
+
+def plot_first_move_matrix(pivot, path):
+    plt.figure(figsize=(8, 5))
+    sns.heatmap(pivot, annot=True, fmt=".3f", cmap="YlGnBu", vmin=0.5, vmax=0.9)
+    plt.title("First-Move Advantage Heatmap (Win Rate)")
+    plt.xlabel("Board Size")
+    plt.ylabel("Strategy")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+
+
+#output file -> (table it shows, plot function)
+FIGURES = {
+    "Strategy vs Strategy Win Rates.png": ("head_to_head", plot_head_to_head),
+    "Aggregate Win , Tie , Loss.png": ("outcomes", plot_outcomes),
+    "Strategy-OpponentBoardSize.png": ("head_to_head_by_size", plot_head_to_head_by_size),
+    "win rate per board size.png": ("win_rates_by_size", plot_win_rates_by_size),
+    "first move adv per board size.png": ("first_move", plot_first_move),
+    "First-Move Advantage Heatmap.png": ("first_move_matrix", plot_first_move_matrix),
+}
+
+
+def _render(job):
+    """worker entry point: draws one figure"""
+    name, table, path =job
+    FIGURES[name][1](table, path)
+    return name
+
+
+#----------------------------------- caching -----------------------------------
+
+def file_hash(path):
+    """sha256 of a file's content (read in blocks)"""
+    digest =hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def table_hash(table):
+    """fingerprint of a table's content: a figure only has to be drawn again when it changes"""
+    digest =hashlib.sha256(str(RENDER_VERSION).encode())
+    digest.update(pd.util.hash_pandas_object(table, index=True).values.tobytes())
+    digest.update(repr((list(table.columns), list(table.index.names))).encode())
+    return digest.hexdigest()
+
+
+def cached_aggregates(results_path, cache_dir, runs=None):
+    """
+    the tables of a results file: loaded from the cache if the file's content was already computed,
+    otherwise the results are loaded once, aggregated and the tables are cached
+    (the cache is only used for the same file content and the same COMPUTE_VERSION)
+    """
+    key =f"v{COMPUTE_VERSION}-{file_hash(results_path)}"
+    if runs is not None:
+        key +="-"+"-".join(str(r) for r in sorted(runs))
+    cache_path =os.path.join(cache_dir, "aggregates.pkl")
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            cached =pickle.load(f)
+        if cached.get("key") ==key:
+            return cached["tables"]
+
+    tables =compute_aggregates(load_results(results_path, runs))
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, "wb") as f:
+        pickle.dump({"key": key, "tables": tables}, f)
+    return tables
+
+
+def build_report(results_path=DEFAULT_RESULTS, out_dir=DEFAULT_OUTPUT, runs=None, workers=None, force=False, show_tables=True):
+    """
+    computes the report of a results file (csv or .db) and writes the figures to out_dir.
+    A figure is only drawn again if its table changed since it was written (or force=True); the figures are
+    drawn in `workers` processes (None = number of cores). Returns the tables and the names of the drawn figures.
+    """
+    cache_dir =os.path.join(out_dir, ".report_cache")
+    tables =cached_aggregates(results_path, cache_dir, runs)
+    if show_tables:
+        print_tables(tables)
+
+    #fingerprints of the tables the existing figures were drawn from
+    manifest_path =os.path.join(cache_dir, "figures.json")
+    manifest ={}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest =json.load(f)
+
+    jobs =[]
+    fingerprints ={}
+    for name, (table_name, _) in FIGURES.items():
+        path =os.path.join(out_dir, name)
+        fingerprints[name] =table_hash(tables[table_name])
+        if force or manifest.get(name) !=fingerprints[name] or not os.path.exists(path):
+            jobs.append((name, tables[table_name], path))
+
+    workers =min(workers or os.cpu_count() or 1, len(jobs))
+    if workers> 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered =list(pool.map(_render, jobs))
+    else:
+        rendered =[_render(job) for job in jobs]
+
+    for name in rendered:
+        manifest[name] =fingerprints[name]
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return tables, rendered
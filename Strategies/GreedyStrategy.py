@@ -1,3 +1,4 @@
+import numpy as np
 from Strategies.Strategy import Strategy
 
 
@@ -6,40 +7,52 @@ class GreedyStrategy(Strategy):
     Strategy that picks the highest number
     """
 
-    def move(self, matrix, last_move, scores):
+    def move(self, state):
         """
         Parameters
-        matrix : list of lists
-            The current board.
-        last_move : tuple or None
-            The (row, col) of the previous move.
-            If None (first turn), pick any available cell.
+        state : GameState
+            The current game. Its legal moves already respect the row/column rule
+            (any free cell on the first turn).
         """
 
-        n= len(matrix)
+        if state.last_move is None:
+            return self._first_move(state)
 
-        #Case 1: first move (no restrictions)
-        if last_move is None:
-            print("first turn")
-            available= [(r, c)
-                for r in range(n)
-                for c in range(n)
-                if matrix[r][c] != '-']
-        else:
-            r0, c0 = last_move
-
-            #Case 2: only pick in the same row or column
-            available= [(r, c)
-                for r in range(n)
-                for c in range(n)
-                if matrix[r][c] != '-' and (r == r0 or c == c0)]
+        available= state.legal_moves()
 
         if not available:
             return None  #no valid move left
 
-        #Pick the highest valid cell
-
-        out= max(available, key=lambda pos: float(matrix[pos[0]][pos[1]]))
+        #Pick the highest valid cell; among equal values the first one in row-major order
+        #(legal_moves() lists the row before the column, so a plain max() would prefer the row)
+        cells= state.cells
+        out= max(available, key=lambda pos: (cells[pos[0]][pos[1]], -pos[0], -pos[1]))
         return out
 
+    @staticmethod
+    def _first_move(state):
+        """
+        Highest free cell on the first turn from the row maxima of the move index (O(N) instead of
+        looking at all N×N cells); the first such cell in row-major order, like `move` on later turns
+        """
+        index= state.index
+        row_max= [top for top in index.row_max if top is not None]
+        if not row_max:
+            return None
+        best= max(row_max)
+        row= index.row_max.index(best)
+        cells_row= state.cells[row]
+        col= next(c for c in index.row_free[row] if cells_row[c]== best)
+        return (row, col)
+
+    def batch_move(self, legal, cand_values, rng):
+        """
+        Move selection for many games at once (used by the BatchSimulationEngine).
+        legal : (games, k) bool array of the candidate cells that may be taken
+        cand_values : (games, k) values of the candidate cells, in row-major order
+        Returns the index of the first legal candidate with the highest value per game,
+        i.e. the same move as `move`.
+        """
+        return np.where(legal, cand_values, np.iinfo(np.int64).min).argmax(axis=1)
+
 
@@ -1,137 +1,137 @@
 import math
+from array import array
 import random
 import sys
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 #look for "Strategy" in the parent directory
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from Strategies.Strategy import Strategy
+from Strategies.Strategy import Strategy, LARGE_BOARD, LARGE_BRANCHING
+from Strategies.endgame_solver import EndgameSolver
+from Strategies.rollouts import batch_rollout
+from Game.GameState import GameState
 
 #set exploration parameter to sqrt(2), is used to balance exploration and exploitation
 UCB_CONST=math.sqrt(2)
+#rollout length in the large-board mode (a whole game would take ~N^2 moves)
+LARGE_ROLLOUT_DEPTH=64
 
 
-#create a MCTSNode class to represent each node in the search tree. Each node corresponds
-# to a specific state of the Row-Column game.
+#the search tree is stored in a MCTSTree: one entry per node in parallel arrays instead of one
+# Python object (with its own copy of the board) per node. Each node corresponds to a specific
+# state of the Row-Column game, which is rebuilt by replaying the moves from the root.
 
-class MCTSNode:
-    def __init__(self, board, last_move, player_turn, parent=None, move=None, scores=(0, 0)):
-        """
-        Initializes a node in the search tree-> what board looks like
-        """
-        self.board=board                      #what game board looks like at this node, according to setup value 0 = taken number
-        self.last_move = last_move              #last move taken
-        self.player_turn =player_turn          #which player's turn it is
-        self.parent =parent                    #parent node of this node/state
-        self.move=move                        #move that resulted in this node's state
-        self.scores =scores                    #store the player's scores for that node
-
-        self.visits=0                       #visit count
-        self.score_total=0.0                #score overview
-        self.children = []                      #list of child nodes
-        
-        #get moves to be explored in the algo
-        self.untried_actions =self.get_available_moves(self.board, self.last_move)
-        
-        #shuffle to ensure random exploration for moves with same value
-        random.shuffle(self.untried_actions)
-        
-        #sort list so highest values are at the end -> pop() will take the best move first (Greedy optimization)
-        self.untried_actions.sort(key=lambda m: self.board[m[0]][m[1]])
+class MCTSTree:
+    """
+    Array-backed MCTS tree ("node arena"). Node i is described by:
+    - visits[i]: visit count
+    - score_total[i]: sum of the rollout results, from the view of the player who made move[i]
+    - move[i]: move that led to the node, as flat index row*n+col (-1 for the root)
+    - parent[i]: index of the parent node (-1 for the root)
+    - first_child[i], child_count[i]: all children of a node are created at once and stored next to each
+      other, so they are first_child[i] ... first_child[i]+child_count[i]-1 (next sibling = index+1).
+      child_count[i] is -1 while the node has not been expanded and 0 for a finished game.
+
+    The root is node 0 and `state` is the GameState at the root; boards of other nodes are never stored.
+
+    `max_nodes` caps the size of the tree. When the children of a node don't fit anymore, the node
+    stays a leaf: the tree stops growing (`full` is set) and the search keeps doing rollouts from the
+    leaves it reaches, so the statistics of the existing nodes still improve.
+    `max_children` (None = no limit) caps the children per node: only the moves with the highest values
+    get a child, the others are never searched.
+    """
 
-    
-    @staticmethod 
-    def get_available_moves(board, last_move):
-        """
-        return all all valid moves from the current state for any board and any last_move-> can use it in simulation
-        """
-        #first move of the game:
-        if last_move is None:
-            return [(r, c) for r, row in enumerate(board) for c, val in enumerate(row) if val!= 0]
-        
-        moves= []
+    def __init__(self, state, max_nodes=1_000_000, max_children=None):
+        self.state=state                 #GameState at the root (private copy, used as work state by the search)
+        self.n =state.n
+        self.max_nodes=max(1, max_nodes)
+        self.max_children=max_children
+        self.full=False                  #True once an expansion was refused because of max_nodes
 
-        #coordinates of last move
-        last_r, last_c =last_move
-        
-        #add all row coordinates to moves list, if they were not taken already (-> not set to 0 in setup)
-        #speed optimization: direct access
-        row_data = board[last_r]
-        for col in range(len(row_data)):
-            if row_data[col]!= 0:
-                moves.append((last_r, col))
-        
-        #same cor columns
-        for r in range(len(board)):
-            if r !=last_r and board[r][last_c]!= 0:
-                moves.append((r, last_c))
-                
-        return moves
-    
-    def is_terminal(self):
-        """Check if the game has ended."""
-        #ends if list of untried actions from node on is empty and have not created any further nodes from here on
-        return len(self.untried_actions)== 0 and len(self.children)==0
-    
-    def is_fully_expanded(self):
-        """
-        returns True if all possible child nodes have been created
-        """
-        return len(self.untried_actions) ==0
-    
-    def expand(self):
-        """
-        adds one of the remaining actions as a child node ->investigate move AI hasn't looked at before
-        """
-        #check if there really are untried moves:
-        if not self.untried_actions:
-            return None
-        
-        action=self.untried_actions.pop()             #take last move from moves list and remove it (best move due to sort)
-        
-        #want to simulate future without messing up present-> copy
-        #manual list comprehension is faster than deepcopy here
-        copied_board =[row[:] for row in self.board]
-        
-        value_of_move= copied_board[action[0]][action[1]]   #get value of action from the copied board
-        copied_board[action[0]][action[1]]=0                  #remove the action on the copied board 
+        self.visits=array('q', [0])
+        self.score_total=array('d', [0.0])
+        self.move=array('i', [-1])
+        self.parent=array('i', [-1])
+        self.first_child=array('i', [-1])
+        self.child_count=array('i', [-1])
 
-        #update scores card: first convert to list because tuples are immutable
-        new_scores =list(self.scores)                      
-        new_scores[self.player_turn-1] +=value_of_move   #if player1's turn, update 1. of score board
+    def __len__(self):
+        return len(self.visits)
 
-        #switch players as child node will be played by other player (if Player1-> 3-1=Player 2)
-        next_player_turn =3-self.player_turn
+    def expand(self, node, state):
+        """
+        creates all children of `node` (whose position is `state`), best greedy move first.
+        Returns False if they don't fit into max_nodes (node stays a leaf).
+        """
+        if self.max_children and state.legal_move_count()> self.max_children:
+            #only the best moves by value (ranked without listing all cells on the first move)
+            moves =state.best_moves(self.max_children)
+        else:
+            moves =state.legal_moves()
+        if len(self.visits)+len(moves)> self.max_nodes:
+            self.full =True
+            return False
+
+        #shuffle to ensure random exploration for moves with same value,
+        #then sort so highest values come first -> they are visited first (Greedy optimization)
+        random.shuffle(moves)
+        cells =state.cells
+        moves.sort(key=lambda m: cells[m[0]][m[1]], reverse=True)
+
+        n =self.n
+        self.first_child[node] =len(self.visits)
+        self.child_count[node] =len(moves)
+        for (r, c) in moves:
+            self.visits.append(0)
+            self.score_total.append(0.0)
+            self.move.append(r*n+c)
+            self.parent.append(node)
+            self.first_child.append(-1)
+            self.child_count.append(-1)
+        return True
+
+    def move_of(self, node):
+        """move that led to `node` as (row, col)"""
+        return divmod(self.move[node], self.n)
+
+    def find_child(self, node, move):
+        """child of `node` reached by `move`, or None"""
+        flat =move[0]*self.n+move[1]
+        first =self.first_child[node]
+        for child in range(first, first+max(self.child_count[node], 0)):
+            if self.move[child] ==flat:
+                return child
+        return None
 
-        #create and add the new child node to the tree
-        child =MCTSNode(board=copied_board, last_move=action, player_turn=next_player_turn, parent=self,
-            move=action, scores=tuple(new_scores))
-        self.children.append(child)
-        return child
-    
-    def best_child(self):
+    def best_child(self, node):
         """
         Select child with best UCB1 score (according to formula on Webpage mentioned above).
         This score balances exploitation of the moves currently known to be good with exploration of 
         less-visited moves to ensure a potentially better strategy hasn't been overlooked
         """
         #initialize
-        best_child =None
+        visits =self.visits
+        score_total =self.score_total
+        first =self.first_child[node]
+        best_child =-1
         best_score =-float('inf')
 
-        #pre-calculate log for speed
-        log_n =math.log(self.visits)
+        #pre-calculate log for speed (an unvisited node only has unvisited children -> first one is returned)
+        log_n =math.log(visits[node]) if visits[node] else 0.0
 
-        for child in self.children:
+        for child in range(first, first+self.child_count[node]):
+            child_visits =visits[child]
             #if a child haven't been visited, choose it to make sure every child is getting visited at least once
-            if child.visits==0:
+            if child_visits==0:
                 return child
 
             # UCB1 formula: \text{UCB1}(i) = \bar{X}_i + c \sqrt{\frac{\ln(N)}{n_i}}
-            exploitation_term= child.score_total/child.visits
-            exploration_term =UCB_CONST*math.sqrt(log_n/child.visits)
+            exploitation_term= score_total[child]/child_visits
+            exploration_term =UCB_CONST*math.sqrt(log_n/child_visits)
             ucb_score=exploitation_term+exploration_term
 
             if ucb_score >best_score:
@@ -139,14 +139,41 @@ class MCTSNode:
                 best_child=child
 
         return best_child
-    
-    
-    def update(self, result):
+
+    def root_children(self):
+        """[(move, visits, score_total)] of the root's children"""
+        first =self.first_child[0]
+        return [(self.move_of(child), self.visits[child], self.score_total[child])
+                for child in range(first, first+max(self.child_count[0], 0))]
+
+    def subtree(self, node, state):
         """
-        updates node's visit count and number of wins during backpropagation
+        new tree with `node` as root (its position is `state`), statistics of the subtree are kept
         """
-        self.visits +=1
-        self.score_total+=result    #-1 if the outcome of simulation is a loss, 0 for draw, 1 for win
+        tree =MCTSTree(state, self.max_nodes, self.max_children)
+        tree.visits[0] =self.visits[node]
+        tree.score_total[0] =self.score_total[node]
+
+        #copy breadth first, so the children of every node stay next to each other
+        queue =[(node, 0)]
+        for old, new in queue:
+            count =self.child_count[old]
+            tree.child_count[new] =count
+            if count<=0:
+                continue
+            first =len(tree.visits)
+            tree.first_child[new] =first
+            old_first =self.first_child[old]
+            for k in range(count):
+                child =old_first+k
+                tree.visits.append(self.visits[child])
+                tree.score_total.append(self.score_total[child])
+                tree.move.append(self.move[child])
+                tree.parent.append(new)
+                tree.first_child.append(-1)
+                tree.child_count.append(-1)
+                queue.append((child, first+k))
+        return tree
 
     
 class MCTSStrategy(Strategy):
@@ -158,116 +185,344 @@ class MCTSStrategy(Strategy):
     -Backpropagation: update nodes with results.
     """
     
-    def __init__(self, max_iterations=10000, time_limit=5):   #set time_limit=0.3 when running multiple simulations to have results in reasonable amount of time 
+    def __init__(self, max_iterations=10000, time_limit=5, endgame_threshold=14, reuse_tree=True,
+                 rollout_batch=1, workers=1, max_nodes=1_000_000, max_children=None, rollout_depth=None,
+                 large_board=LARGE_BOARD):   #set time_limit=0.3 when running multiple simulations to have results in reasonable amount of time 
         """
         Want to have speed and efficiency limit.
         Speed limit-> don't have to wait too long
+        endgame_threshold: once at most this many free cells can still be reached, the exact
+        endgame solver plays instead of random rollouts (0 = never). The solver may use half of
+        time_limit; if it has not finished by then, the search runs for the rest of the time
+        reuse_tree: keep the search tree between moves and continue from the subtree of the
+        moves actually played (our move + the opponent's reply)
+        rollout_batch: number of playouts per simulation step. With more than 1, the playouts run
+        at once as NumPy batch (see rollouts.py) and their averaged result is backed up
+        workers: number of processes for root-parallel search. With more than 1, every worker runs
+        its own search (own seed, same deadline) and the visit counts/scores of the root children
+        are summed before the move is chosen. The worker processes are kept for the following moves
+        max_nodes: size limit of the search tree (see MCTSTree); once reached, the tree stops
+        growing and the remaining iterations only run rollouts from its leaves
+        max_children: only the max_children moves with the highest values get a child node
+        rollout_depth: a rollout is stopped after this many moves and scored by the score difference so far
+        Both None = no limit on boards up to large_board x large_board; on larger boards (large-board mode)
+        LARGE_BRANCHING children per node and rollouts of LARGE_ROLLOUT_DEPTH moves, so an iteration
+        no longer plays a whole game of ~N^2 moves
         """
         self.max_iterations=max_iterations
         self.time_limit= time_limit
-
-    def move(self, board, last_move, scores):
+        self.endgame_threshold=endgame_threshold
+        self.endgame=EndgameSolver()
+        self.reuse_tree=reuse_tree
+        self.max_nodes=max_nodes
+        self.max_children=max_children
+        self.rollout_depth=rollout_depth
+        self.large_board=large_board
+        self._tree=None          #kept search tree (None -> build a new one)
+        self._total_sum=1        #normalization of the kept tree's rollout results
+        self.reused_visits=0     #visits inherited from the previous move's tree
+        self.iterations=0        #iterations run during the last move
+        self.rollout_batch=rollout_batch
+        #numpy generator for batch rollouts, seeded from `random` so random.seed() keeps games reproducible
+        self._np_rng=np.random.default_rng(random.getrandbits(64))
+        self.workers=workers
+        self._pools=None         #one single-process pool per worker for root-parallel search, created on the first move
+
+    def __getstate__(self):
+        #the process pools can't be pickled (e.g. when the strategy is sent to another process)
+        state =self.__dict__.copy()
+        state['_pools'] =None
+        return state
+
+    def close(self):
+        """shut down the worker processes of the root-parallel mode (started again when needed)"""
+        if self._pools is not None:
+            for pool in self._pools:
+                pool.shutdown()
+            self._pools =None
+
+    def search_stats(self):
+        return {"iterations": self.iterations}
+
+    def _limits(self, state):
+        """(max_children, rollout_depth) for this board: the set values, or the large-board defaults"""
+        if state.n<= self.large_board:
+            return self.max_children, self.rollout_depth
+        max_children =self.max_children if self.max_children is not None else LARGE_BRANCHING
+        rollout_depth =self.rollout_depth if self.rollout_depth is not None else LARGE_ROLLOUT_DEPTH
+        return max_children, rollout_depth
+
+    def _reuse_root(self, state):
         """
-        Analyzes the current game state and returns the best move.
+        find the node of the kept tree that corresponds to `state` by following the moves
+        played since the tree's root. Returns None if the tree does not belong to this game
+        or the position was never expanded.
         """
+        tree =self._tree
+        if tree is None or tree.state.values is not state.values:
+            return None
+        played =state.played_moves()
+        done =tree.state.moves_made
+        if len(played)< done or played[:done]!= tree.state.played_moves():
+            return None
 
-        #until now have used 0 for used moves, but in gamehandler is a "-" -> convert:
-        internal_board =[[0 if cell=="-" else cell for cell in row] for row in board]
+        node =0
+        for move in played[done:]:
+            node =tree.find_child(node, move)
+            if node is None:
+                return None
+        return node
 
-        #calculate total sum available on board -> used to normalize score later
-        total_sum =sum(v for row in internal_board for v in row if v>0) or 1
+    def move(self, state):
+        """
+        Analyzes the current game state and returns the best move.
+        """
 
-        #determine whose turn it is by counting the moves already made.
-        moves_made =sum(row.count(0) for row in internal_board)
-        player_id=2 if moves_made%2 else 1
-        
         #start stopping thinking time:
-        start_time = time.time()
-
-        #create root node= current state of real game
-        root =MCTSNode(board=internal_board, last_move=last_move, player_turn=player_id, scores=tuple(scores))
+        deadline = time.time()+self.time_limit
+        self.iterations =0
 
         #trivial moves: if no move available return None, and if only 1 move available choose that without simulating
-        if not root.untried_actions:
+        count =state.legal_move_count()
+        if not count:
             return None
-        if len(root.untried_actions) ==1:
-            return root.untried_actions[0]
+        if count ==1:
+            return state.legal_moves()[0]
+
+        #endgame: few reachable cells left -> exact solver instead of random rollouts
+        #(it gets half of the time limit; if it is not done by then the search uses the rest)
+        solved =self.endgame.try_solve(state, self.endgame_threshold, self.time_limit/2)
+        if solved is not None:
+            return solved[0]
+
+        if self.workers>1:
+            return self._parallel_move(state, deadline)
+
+        return self._single_move(state, deadline)
+
+    def _single_move(self, state, deadline):
+        """search in this process and play the root child with the most visits"""
+        tree =self.search(state, deadline)
+        children =tree.root_children()
+        if not children:
+            #deadline already over before the root was expanded: best greedy move
+            return state.best_moves(1)[0]
+        #select child with highest visit count -> most robust move when time is short
+        best_move, _, _ =max(children, key=lambda child: child[1])
+        return best_move
+
+    def search(self, state, deadline):
+        """
+        Runs the four MCTS phases from `state` until the deadline and returns the search tree.
+        """
+        #continue from the subtree of the actually played moves if we still have it
+        #(private copy of the state as the tree's root, so the caller's state is never modified)
+        max_children, rollout_depth =self._limits(state)
+        node =self._reuse_root(state) if self.reuse_tree else None
+        if node is not None:
+            #copy the subtree into a new tree -> the rest of the old tree is dropped
+            tree =self._tree.subtree(node, state.copy())
+            total_sum =self._total_sum
+            self.reused_visits =tree.visits[0]
+        else:
+            #calculate total sum available on board -> used to normalize score later
+            #(kept with the tree, so reused statistics stay on the same scale)
+            total_sum =sum(state.index.row_sum) or 1
+            if rollout_depth:
+                #a cut-off rollout collects at most rollout_depth cells
+                total_sum =min(total_sum, rollout_depth*max(top for top in state.index.row_max if top is not None))
+            #create root node= current state of real game
+            tree =MCTSTree(state.copy(), self.max_nodes, max_children)
+            self.reused_visits =0
+        self._tree =tree
+        self._total_sum =total_sum
+
+        #the root state is the work state: moves are applied while walking down and undone afterwards
+        work =tree.state
+        root_moves =work.moves_made
+        visits =tree.visits
+        child_count =tree.child_count
         
         #repeat 4 steps of MCTS as many times as possible-> until the time runs out
-        while (time.time()-start_time< self.time_limit):
-
-            #Selection: travels down the tree, with UCB1 until it hits a node that hasn't been fully explored (=leaf)
-            node =root
-            while not node.is_terminal() and node.is_fully_expanded():
-                node =node.best_child()
-            
-            #Expansion: at leaves pick one move, it hasn't tried before and create a new child node for it
-            #due to sorting in __init__, this picks the best greedy move first
-            if not node.is_terminal() and not node.is_fully_expanded():
-                node= node.expand()
+        self.iterations =0
+        while (time.time()< deadline):
+            self.iterations +=1
+
+            #Selection: travels down the tree with UCB1 until it reaches a child that was never visited (=leaf)
+            #Expansion: a visited leaf gets all its children at once; best_child then picks the first
+            #unvisited one, which due to sorting in expand is the best greedy move
+            node =0
+            while True:
+                if child_count[node]< 0 and not tree.expand(node, work):
+                    break   #tree is full -> rollout from this leaf
+                if child_count[node]== 0:
+                    break   #game over at this node
+                node =tree.best_child(node)
+                work.apply(tree.move_of(node))
+                if visits[node]== 0:
+                    break
+
+            #Simulation: AI plays randomly until the game ends (one playout, or the average of a batch)
+            if self.rollout_batch>1:
+                result= self.simulate_batch(work, total_sum, rollout_depth)
+            else:
+                result= self.simulate(work, total_sum, rollout_depth)
 
-            #Simulation: AI plays randomly until the game ends
-            result= self.simulate(node, total_sum)
+            #back to the root position
+            while work.moves_made> root_moves:
+                work.undo()
             
             #Backpropagation: AI traces its steps back up the tree, back o root
-            self.backpropagate(node, result)
+            self.backpropagate(tree, node, result)
 
-        #select child with highest visit count -> most robust move when time is short
-        best_child =max(root.children, key=lambda c: c.visits)
-        return best_child.move
+        return tree
 
-    def simulate(self, node, total_sum):
+    def _parallel_move(self, state, deadline):
         """
-        Simulation phase: play a random game and return the outcome
+        Root parallelization: every worker searches the same position with its own seed until the
+        same deadline; the root children's visits and scores are summed over the workers.
+        Every worker has its own single-process pool and gets exactly one job per move: with one shared
+        pool a process could take two jobs, and its second search (reused tree, deadline over) would
+        return the same root statistics again.
         """
-        #want to simulate future without messing up present-> copy
-        copied_board =[row[:] for row in node.board]
-        copied_last_move = node.last_move
-        
-        #track scores locally
-        p1_score =node.scores[0]
-        p2_score= node.scores[1]
-        
-        #player whose perspective will evaluate the final score from.
-        perspective_player = node.player_turn
-
-        #track turn in simulation
-        sim_turn = node.player_turn
+        if self._pools is None:
+            self._pools =[ProcessPoolExecutor(max_workers=1) for _ in range(self.workers)]
+
+        settings ={'endgame_threshold': self.endgame_threshold, 'reuse_tree': self.reuse_tree,
+                   'rollout_batch': self.rollout_batch, 'max_nodes': self.max_nodes,
+                   'max_children': self.max_children, 'rollout_depth': self.rollout_depth, 'large_board': self.large_board}
+        played =state.played_moves()
+        jobs =[pool.submit(_worker_search, state.values, played, deadline,
+                           random.getrandbits(64), settings)
+               for pool in self._pools]
+
+        visits ={}
+        scores ={}
+        self.iterations =0
+        for job in jobs:
+            children, iterations =job.result()
+            self.iterations +=iterations
+            for move, child_visits, score_total in children:
+                visits[move] =visits.get(move, 0)+child_visits
+                scores[move] =scores.get(move, 0.0)+score_total
+
+        if not visits:
+            #no worker got to expand the root before the deadline (e.g. slow process start)
+            return self._single_move(state, deadline)
+
+        #most visits over all workers, average score breaks ties
+        return max(visits, key=lambda m: (visits[m], scores[m]/max(visits[m], 1)))
+
+    def simulate(self, sim_state, total_sum, max_plies=None):
+        """
+        Simulation phase: play a random game from `sim_state` and return the outcome.
+        max_plies: stop after this many moves (None = play to the end) and score the game as it is then
 
+        A full rollout runs on a flat list with the values of the free cells (None = taken): a move only
+        clears one entry, no move index or free mask has to be kept up to date, and `sim_state` is not
+        changed. A cut-off rollout (large-board mode) plays on `sim_state` itself instead, because
+        copying N*N cells would cost more than its few moves.
+        """
+        if max_plies is not None:
+            return self._simulate_in_place(sim_state, total_sum, max_plies)
+
+        n =sim_state.n
+        cells =sim_state.cells
+        row_free =sim_state.index.row_free
+        #flat board: value of every free cell at r*n+c, None for taken cells
+        left =[None]*(n*n)
+        for r in range(n):
+            base =r*n
+            cells_row =cells[r]
+            for c in row_free[r]:
+                left[base+c] =cells_row[c]
+
+        scores =list(sim_state.scores)
+        mover =sim_state.current_player
+        #player whose perspective will evaluate the final score from (side to move at the leaf)
+        perspective =mover
+        last =sim_state.last_move
         while True:
-            #get available moves manually to avoid function overhead
-            moves = []
-            if copied_last_move is None:
-                 moves = [(r, c) for r, row in enumerate(copied_board) for c, val in enumerate(row) if val != 0]
+            #legal moves in the order of GameState.legal_moves: the free cells of the last move's row,
+            #then those of its column (the last move's cell is taken, so it is in neither)
+            if last is None:
+                moves =[i for i in range(n*n) if left[i] is not None]
             else:
-                lastrow, lastcol =copied_last_move
-                #add all row coordinates
-                moves.extend([(lastrow, col) for col in range(len(copied_board[0])) if copied_board[lastrow][col]!= 0])
-                #same for columns
-                moves.extend([(row, lastcol) for row in range(len(copied_board)) if row !=lastrow and copied_board[row][lastcol]!= 0])
+                r, c =last
+                base =r*n
+                moves =[base+j for j in range(n) if left[base+j] is not None]
+                moves.extend([i for i in range(c, n*n, n) if left[i] is not None])
 
             if not moves:
                 break #Game over
 
             #epsilon = 0.5 -> instead of pure random choice, want 50% to be greedy heuristics-> no waste of time on bad moves
             if random.random()<0.5:
-                move = random.choice(moves)
+                move =random.choice(moves)
             else:
-                #pick the move with the highest immediate value
-                move =max(moves, key=lambda m: copied_board[m[0]][m[1]])
-            
-            #apply random move to the temporary state & get value for it
-            val =copied_board[move[0]][move[1]]
-            copied_board[move[0]][move[1]]=0
-            #add value to scores
-            if sim_turn ==1:
-                p1_score +=val
+                #pick the move with the highest immediate value (the first one on ties)
+                move =max(moves, key=left.__getitem__)
+
+            #take the cell: value to the mover, then the other player moves
+            scores[mover] +=left[move]
+            left[move] =None
+            last =divmod(move, n)
+            mover =1-mover
+
+        #score difference from the perspective player's point of view
+        return (scores[perspective]-scores[1-perspective])/total_sum
+
+    def _simulate_in_place(self, sim_state, total_sum, max_plies=None):
+        """
+        `simulate` on the game state itself: the moves are applied to `sim_state` (the search undoes
+        them afterwards) and picked straight from its move index, so a move costs O(1) regardless of N
+        """
+        cells =sim_state.cells
+        index =sim_state.index
+        
+        #player whose perspective will evaluate the final score from (side to move at the leaf)
+        perspective_player = sim_state.current_player+1
+
+        plies =0
+        while max_plies is None or plies< max_plies:
+            plies +=1
+            if sim_state.last_move is None:
+                #first move of the game: any free cell
+                moves =sim_state.legal_moves()
+                if not moves:
+                    break
+                move =random.choice(moves) if random.random()<0.5 else max(moves, key=lambda m: cells[m[0]][m[1]])
+                sim_state.apply(move)
+                continue
+
+            #the legal moves are the free cells of the last move's row followed by those of its column;
+            #they are picked straight from the move index without building the list
+            r, c =sim_state.last_move
+            row_free =index.row_free[r]
+            col_free =index.col_free[c]
+            count =len(row_free)+len(col_free)
+
+            if not count:
+                break #Game over
+
+            #epsilon = 0.5 -> instead of pure random choice, want 50% to be greedy heuristics-> no waste of time on bad moves
+            if random.random()<0.5:
+                #same draw as random.choice() on the list of legal moves
+                k =random.randrange(count)
+                move =(r, row_free[k]) if k< len(row_free) else (col_free[k-len(row_free)], c)
             else:
-                p2_score +=val
+                #pick the move with the highest immediate value (the first one in legal move order on ties)
+                row_max, col_max =index.row_max[r], index.col_max[c]
+                if col_max is None or (row_max is not None and row_max>= col_max):
+                    cells_row =cells[r]
+                    move =(r, next(j for j in row_free if cells_row[j]== row_max))
+                else:
+                    move =(next(i for i in col_free if cells[i][c]== col_max), c)
             
-            #move in simulation and swithc player
-            copied_last_move =move
-            sim_turn =3-sim_turn
+            #apply move to the temporary state: adds value to the mover's score and switches player
+            sim_state.apply(move)
+
+        p1_score, p2_score =sim_state.scores
 
         #calculate final scores from the perspective_player's point of view
         if perspective_player== 1:
@@ -279,22 +534,57 @@ class MCTSStrategy(Strategy):
         return raw/total_sum
     
     
-    def backpropagate(self, node, result):
+    def simulate_batch(self, state, total_sum, max_plies=None):
+        """
+        Simulation phase with `rollout_batch` playouts from `state` at once (same epsilon-greedy policy),
+        returns their averaged outcome from the side to move's point of view
+        """
+        diffs =batch_rollout(state, self.rollout_batch, 0.5, self._np_rng, max_plies)
+        return float(diffs.mean())/total_sum
+
+    def backpropagate(self, tree, node, result):
         """
         backpropagation phase: update node statistics up the tree
         """
-        #start at leaf node
-        current_node =node
+        #start at leaf node, its statistics are from the view of the player who moved into it
+        visits =tree.visits
+        score_total =tree.score_total
+        parent =tree.parent
         sign =-1
         
         #move up and give results back 
-        while current_node is not None:
-            current_node.update(sign*result)
+        while node>= 0:
+            visits[node] +=1
+            score_total[node] +=sign*result
             sign =-sign
-            current_node =current_node.parent
-
-
+            node =parent[node]
 
 
+#state of a worker process of the root-parallel mode: one strategy (its tree is reused between
+#moves like in the single-process mode) and the board it is playing on
+_worker_strategy =None
+_worker_settings =None
+_worker_board =None
 
 
+def _worker_search(values, played, deadline, seed, settings):
+    """
+    runs in a worker process: rebuilds the position from the board and the played moves, searches
+    until the deadline and returns [(move, visits, score_total)] of the root children and the iterations
+    """
+    global _worker_strategy, _worker_settings, _worker_board
+    if _worker_strategy is None or _worker_settings !=settings:
+        _worker_strategy =MCTSStrategy(**settings)
+        _worker_settings =settings
+    if _worker_board is None or not np.array_equal(_worker_board.values, values):
+        _worker_board =GameState(values)
+
+    #replay on a copy of the kept start position, so values stay the same object and the tree can be reused
+    state =_worker_board.copy()
+    for move in played:
+        state.apply(move)
+
+    random.seed(seed)
+    _worker_strategy._np_rng =np.random.default_rng(seed)
+    tree =_worker_strategy.search(state, deadline)
+    return tree.root_children(), _worker_strategy.iterations
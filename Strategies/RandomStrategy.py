@@ -1,4 +1,5 @@
 import random as rd
+import numpy as np
 from Strategies.Strategy import Strategy
 
 
@@ -19,36 +20,18 @@ class RandomStrategy(Strategy):
         It returns the chosen `(row, col)` tuple, or `None` if no legal moves remain.
         """
 
-    def move(self, matrix,last_move, scores):
+    def move(self, state):
         """
         Parameters
-        matrix : list of lists
-            The current board.
-        last_move : tuple or None
-            The (row, col) of the previous move.
-            If None (first turn), pick any available cell.
+        state : GameState
+            The current game. On the first turn every free cell is legal,
+            afterwards only free cells in the row or column of the last move.
         """
 
-        n = len(matrix)
-
-        # case 1: first move, without restrictions
-        if last_move is None:
-            print("first turn")
-            available = [
-                (r, c)
-                for r in range(n)
-                for c in range(n)
-                if matrix[r][c] != '-'
-            ]
-        else:
-            r0, c0 = last_move
-            # case 2 : only pick in the same row or column
-            available = [
-                (r, c)
-                for r in range(n)
-                for c in range(n)
-                if matrix[r][c] != '-' and (r == r0 or c == c0)
-            ]
+        if state.last_move is None:
+            return self._first_move(state)
+
+        available = state.legal_moves()
 
         if not available:
             return None  # no valid move left
@@ -56,5 +39,31 @@ class RandomStrategy(Strategy):
         # Pick a random valid cell
         out=rd.choice(available)
         return out
+
+    @staticmethod
+    def _first_move(state):
+        """
+        Random free cell on the first turn without listing all N×N cells: the k-th free cell in
+        row-major order is found through the free counts per row (same cell as rd.choice(legal_moves())).
+        """
+        index = state.index
+        if not index.free_count:
+            return None
+        k = rd.randrange(index.free_count)
+        for row, count in enumerate(index.row_count):
+            if k < count:
+                return (row, index.row_free[row][k])
+            k -= count
+
+    def batch_move(self, legal, cand_values, rng):
+        """
+        Move selection for many games at once (used by the BatchSimulationEngine).
+        legal : (games, k) bool array of the candidate cells that may be taken
+        cand_values : (games, k) values of the candidate cells (not needed here)
+        rng : numpy random Generator
+        Returns the index of a uniformly chosen legal candidate per game
+        (the legal candidate with the largest random key).
+        """
+        return np.where(legal, rng.random(legal.shape), -1.0).argmax(axis=1)
     
 
@@ -1,7 +1,26 @@
+# Large-board mode of the search strategies (Minimax, MCTS): on boards with N > LARGE_BOARD they only
+# look at the LARGE_BRANCHING moves with the highest cell values in every position, so the cost of a
+# node grows with N instead of N^2 and the size of the search no longer depends on N at all.
+LARGE_BOARD = 16
+LARGE_BRANCHING = 10
+
+
 class Strategy:
     """
     Base class for game strategies
     Every substrategy has to implement the method move
     """
-    def move(self, matrix,last_move):
+    def move(self, state):
+        """
+        state : Game.GameState.GameState
+            The current game (board values, free cells, scores, last move, side to move).
+        Returns the chosen (row, col) or None if no legal move is left.
+        """
         raise NotImplementedError("You must implement the method move()")
+
+    def search_stats(self):
+        """
+        Statistics of the last move() call, e.g. {"nodes": ..., "depth": ...} for search strategies.
+        Used by the instrumentation of the SimulationEngine; strategies without a search return {}.
+        """
+        return {}
@@ -0,0 +1,163 @@
+import time
+from typing import Optional, Tuple
+
+# memo entries kept between moves; a larger memo is cleared before the next solve (~200 bytes per entry)
+MEMO_LIMIT = 250_000
+
+
+class SolveTimeout(Exception):
+    # raised inside the solver when the time limit of try_solve has passed
+    pass
+
+
+class EndgameSolver:
+    """
+    Exact solver for the last phase of a Row-Column game.
+
+    Positions are described by a bitmask of the free cells (bit r*n + c) and the index of
+    the last move. The solver computes, by memoized negamax, the best possible future
+    margin for the side to move:
+
+        margin(free, last) = max over legal moves m of  value(m) - margin(free without m, m)
+                             (0 if there is no legal move)
+
+    Scores already collected do not influence the optimal play, so the memo is valid for
+    every position of one board and is kept until a different board is solved (or it grows
+    beyond MEMO_LIMIT entries). A solve with a time limit stops when the time is up; the
+    exact values found so far stay in the memo.
+
+    Before solving, free cells that can never be reached again are dropped: starting from the
+    row and column of the last move, rows and columns are connected through free cells, and
+    cells outside that closure cannot be played by either side anymore.
+    """
+
+    def __init__(self):
+        self._values = None   # board the memo belongs to
+        self.memo = {}
+        self._deadline = None  # perf_counter() deadline of the running solve
+        self._calls = 0
+
+    def _prepare(self, state):
+        if self._values is not state.values:
+            n = state.n
+            self._values = state.values
+            self.n = n
+            self.cell_values = [v for row in state.cells for v in row]
+            self.row_bits = [((1 << n) - 1) << (r * n) for r in range(n)]
+            column = sum(1 << (r * n) for r in range(n))
+            self.col_bits = [column << c for c in range(n)]
+            self.memo = {}
+        elif len(self.memo) > MEMO_LIMIT:
+            self.memo = {}
+
+    @staticmethod
+    def reachable_rows(state, limit=None):
+        """
+        rows that can still be played into. The closure is symmetric, so every free cell of
+        these rows lies in a reachable column and vice versa.
+        With `limit`, the search stops and returns None as soon as the rows found so far hold
+        more than `limit` free cells (on a large board that is usually the first row).
+        """
+        index = state.index
+        if state.last_move is None:
+            if limit is not None and index.free_count > limit:
+                return None
+            return set(range(state.n))
+
+        rows, cols = set(), set()
+        cells = 0
+        todo_rows, todo_cols = [state.last_move[0]], [state.last_move[1]]
+        while todo_rows or todo_cols:
+            while todo_rows:
+                r = todo_rows.pop()
+                if r in rows:
+                    continue
+                rows.add(r)
+                cells += index.row_count[r]
+                if limit is not None and cells > limit:
+                    return None
+                todo_cols.extend(c for c in index.row_free[r] if c not in cols)
+            while todo_cols:
+                c = todo_cols.pop()
+                if c in cols:
+                    continue
+                cols.add(c)
+                todo_rows.extend(r for r in index.col_free[c] if r not in rows)
+        return rows
+
+    def reachable_mask(self, state) -> int:
+        """bitmask of the free cells that can still be played from the current position"""
+        self._prepare(state)
+        n = state.n
+        mask = 0
+        for r in self.reachable_rows(state):
+            for c in state.index.row_free[r]:
+                mask |= 1 << (r * n + c)
+        return mask
+
+    def try_solve(self, state, threshold: int, time_limit: Optional[float] = None):
+        """
+        solve(state) if at most `threshold` free cells are still reachable, otherwise None.
+        With `time_limit` (seconds), None is also returned if the solve takes longer.
+        Used by the search strategies to hand the endgame over to the solver.
+        """
+        if threshold <= 0:
+            return None
+        if state.index.free_count > threshold and self.reachable_rows(state, threshold) is None:
+            return None
+        if time_limit is None:
+            return self.solve(state)
+        self._deadline = time.perf_counter() + time_limit
+        try:
+            return self.solve(state)
+        except SolveTimeout:
+            return None
+        finally:
+            self._deadline = None
+
+    def _negamax(self, mask: int, last: int) -> int:
+        key = (mask, last)
+        best = self.memo.get(key)
+        if best is not None:
+            return best
+        self._calls += 1
+        if self._deadline is not None and not self._calls & 1023 and time.perf_counter() >= self._deadline:
+            raise SolveTimeout
+
+        if last < 0:
+            band = mask
+        else:
+            band = mask & (self.row_bits[last // self.n] | self.col_bits[last % self.n])
+
+        best = 0 if not band else None
+        values = self.cell_values
+        while band:
+            low = band & -band
+            band ^= low
+            i = low.bit_length() - 1
+            v = values[i] - self._negamax(mask ^ low, i)
+            if best is None or v > best:
+                best = v
+
+        self.memo[key] = best
+        return best
+
+    def solve(self, state) -> Tuple[Optional[Tuple[int, int]], int]:
+        """
+        Returns (optimal move, final score margin) for the side to move in `state`.
+        The margin is the side to move's final score minus the opponent's under optimal play.
+        The move is None if the game is already over.
+        """
+        mask = self.reachable_mask(state)
+        n = self.n
+        me = state.scores[state.current_player]
+        opp = state.scores[1 - state.current_player]
+
+        best_move, best = None, None
+        for (r, c) in state.legal_moves():
+            i = r * n + c
+            v = self.cell_values[i] - self._negamax(mask & ~(1 << i), i)
+            if best is None or v > best:
+                best_move, best = (r, c), v
+
+        return best_move, me - opp + (best or 0)
@@ -1,121 +1,71 @@
 import math
-from copy import deepcopy
 import sys
 import os
+import time
 from typing import List, Optional, Tuple
 
 # Look for "Strategy" in the parent directory (your original structure)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from .Strategy import Strategy
-
-
-class AlphaBetaNode:
-
-    # A node representing a specific Row-Column game state.
-    # Nodes are treated as immutable snapshots: board, last_move, whose turn, scores.
-
-    def __init__(
-        self,
-        board: List[List[int]],
-        last_move: Optional[Tuple[int, int]],
-        player_id: int,
-        parent: Optional["AlphaBetaNode"] = None,
-        move: Optional[Tuple[int, int]] = None,
-        scores: Tuple[int, int] = (0, 0),
-    ):
-        #Board uses 0 to denote "taken" cells. Only non-zero cells are available.
-        # this node does not mutate its board (children get deep copies).
-        self.board = board
-        self.last_move = last_move
-        self.player_id = player_id          # 1 or 2: whose turn at THIS node
-        self.parent = parent
-        self.move = move                    # move taken from parent to reach this node
-        self.scores = scores                # (score_p1, score_p2)
-        self.children: List["AlphaBetaNode"] = []
-        self._cached_moves: Optional[List[Tuple[int, int]]] = None  # avoid recompute
-
-    def get_available_moves(self) -> List[Tuple[int, int]]:
-        # Return all valid moves from the current state.
-        # caches the result since nodes are immutable snapshots.
-    
-        if self._cached_moves is not None:
-            return self._cached_moves
-
-        # Row-Column rule: first move - choose any non-zero cell; afterwards - moves must lie in the same row OR same column as last_move.
-        if self.last_move is None:
-            moves = [(r, c)
-                     for r, row in enumerate(self.board)
-                     for c, val in enumerate(row) if val != 0]
-            self._cached_moves = moves
-            return moves
-
-        last_r, last_c = self.last_move
-        moves: List[Tuple[int, int]] = []
-
-        # same row
-        for c, val in enumerate(self.board[last_r]):
-            if val != 0:
-                moves.append((last_r, c))
-
-        # same column (avoid duplicating the (last_r, last_c) intersection)
-        for r, row in enumerate(self.board):
-            if r != last_r and row[last_c] != 0:
-                moves.append((r, last_c))
-
-        self._cached_moves = moves
-        return moves
-
-    def is_terminal(self) -> bool:
-        # no valid moves remain in the current row/column band.
-        return len(self.get_available_moves()) == 0
-
-    def generate_children(self) -> List["AlphaBetaNode"]:
-    
-    #Create child nodes for all possible moves from this state.
-    # results are cached in self.children to avoid regeneration.
-    #Update the correct player's score:
-    # at this node, self.player_id identifies who is making the move.
-    #  That player receives the numeric value of the chosen cell.
-
-        if self.children:
-            return self.children
-
-        next_player_id = 3 - self.player_id  # swap 1 <-> 2
-        for move in self.get_available_moves():
-            r, c = move
-            val = self.board[r][c]
-
-            # Copy board and mark the move as taken
-            new_board = [row[:] for row in self.board]
-            new_board[r][c] = 0
-
-            # update scores (current node's player collects the value)
-            s1, s2 = self.scores
-            if self.player_id == 1:
-                s1 += val
-            else:
-                s2 += val
+from .Strategy import Strategy, LARGE_BOARD, LARGE_BRANCHING
+from Game.GameState import GameState
+from .transposition_table import ZobristHasher, TranspositionTable, EXACT, LOWER, UPPER
+from .endgame_solver import EndgameSolver
+
+
+# The search runs on ONE mutable GameState: every move is applied before descending
+# and undone afterwards (make/unmake). No node objects or board copies are kept, so
+# memory stays O(depth) instead of O(nodes x N^2) and the node budget can be raised freely.
+#
+# Positions reached through different move orders are shared through a Zobrist-hashed
+# transposition table. The key covers (free cells, last move, side to move); the score split
+# is not part of it, so values are stored relative to the ROOT player's current score difference.
 
-            child = AlphaBetaNode(
-                board=new_board,
-                last_move=move,
-                player_id=next_player_id,
-                parent=self,
-                move=move,
-                scores=(s1, s2),
-            )
-            self.children.append(child)
-        return self.children
+class _SearchTimeout(Exception):
+    # raised inside the search when the iterative-deepening deadline has passed
+    pass
 
 
 class AlphaBetaStrategy(Strategy):
-    def __init__(self, max_nodes_budget: int = 60_000, hard_depth_cap: int = 12):
+    def __init__(self, max_nodes_budget: int = 60_000, hard_depth_cap: int = 12,
+                 tt_size: int = 1 << 18, tt_replacement: str = "depth",
+                 time_limit: Optional[float] = None, endgame_threshold: int = 14,
+                 beam_width: Optional[int] = None, large_board: int = LARGE_BOARD,
+                 endgame_time_limit: float = 1.0):
         # max_nodes_budget: target upper bound on nodes per move (rough heuristic).
         # hard_depth_cap: never search deeper than this (safety).
+        # tt_size: number of transposition table slots (0 disables the table).
+        # tt_replacement: "depth" (keep deeper entries) or "always" (newest entry wins).
+        # time_limit: seconds per move. If set, iterative deepening replaces the
+        #   budget-based depth and returns the deepest completed search (e.g. 0.2 = "best move in 200 ms").
+        # endgame_threshold: once at most this many free cells are still reachable, the exact
+        #   endgame solver picks the move instead of the heuristic search (0 disables it).
+        # endgame_time_limit: seconds the solver may take without a time_limit (with one it gets half
+        #   of it). A solve that does not finish in time falls back to the heuristic search.
+        # beam_width: only the beam_width moves with the highest values are searched in every position.
+        #   None = all moves on boards up to large_board x large_board, LARGE_BRANCHING moves on larger
+        #   boards (large-board mode). In the large-board mode the transposition table is not used:
+        #   its Zobrist keys and the root hash would cost O(N^2) memory and time per move.
     
         self.max_nodes_budget = max_nodes_budget
         self.hard_depth_cap = hard_depth_cap
+        self.time_limit = time_limit
         self.player_id = 1  # set in move()
+        self.nodes_searched = 0  # nodes visited during the last move()
+        self.depth_reached = 0   # deepest completed search depth of the last move()
+        self._deadline = None    # perf_counter() deadline of the running iteration
+        self.endgame_threshold = endgame_threshold
+        self.endgame = EndgameSolver()
+        self.endgame_time_limit = endgame_time_limit
+        self.endgame_margin = None  # exact final margin if the last move() was solved exactly
+        self.beam_width = beam_width
+        self.large_board = large_board
+        self._beam = None           # beam width of the running move() (None = all moves)
+
+        # the table is kept between moves of the same game (same board values, same root player)
+        self.tt = TranspositionTable(tt_size, tt_replacement) if tt_size > 0 else None
+        self._hasher = None
+        self._tt_values = None   # board and root player the table entries belong to
+        self._tt_player = None
 
     # Depth selection rationale:
     # We estimate how deep we can search in the decision tree without exploding the node count.
@@ -124,14 +74,14 @@ class AlphaBetaStrategy(Strategy):
     # Then clamp depth by remaining moves and a safety cap.
     #This produces deeper search on small boards and shallower search on large boards. (Still has great performance but runs more smoothly)
 
-    def _dynamic_depth(self, board, last_move) -> int:
+    def _dynamic_depth(self, state: GameState) -> int:
         # Pick a depth that fits the board size and remaining moves,
         # assuming effective branching ~ min(2N-1, 10). Then solve b^d ≈ budget.
     
-        n = len(board)
-        nonzero = sum(1 for r in board for v in r if v != 0)
-        # effective branching after the first move; clamp for sanity
-        b = max(2, min(2 * n - 1, 10))
+        n = state.n
+        nonzero = state.index.free_count
+        # effective branching after the first move; clamp for sanity (the beam width if there is one)
+        b = max(2, self._beam) if self._beam else max(2, min(2 * n - 1, 10))
 
         # solve b^d <= budget  ->  d <= log(budget)/log(b)
         import math
@@ -139,44 +89,112 @@ class AlphaBetaStrategy(Strategy):
         # never exceed remaining plies or the hard cap
         d = min(d, nonzero, self.hard_depth_cap)
 
-        # small boards can afford more depth
+        # small boards can afford more depth (with a beam its width already sets the depth)
+        if self._beam:
+            return max(1, d)
         if n <= 3:
             d = min(nonzero, 9)  # full search on 3x3
         elif n == 4:
             d = min(d + 1, nonzero)  # a gentle boost
         return max(1, d)
 
-    def move(self, board, last_move, scores):
-        # normalize "-" -> 0
-        internal_board = [[0 if cell == "-" else cell for cell in row] for row in board]
-
+    def _prepare_tt(self, state: GameState) -> int:
+        # returns the Zobrist hash of the root; a new board (or a new root player)
+        # invalidates everything stored so far
+        if self._tt_values is not state.values or self._tt_player != self.player_id:
+            if self._hasher is None or self._hasher.n != state.n:
+                self._hasher = ZobristHasher(state.n)
+            self.tt.clear()
+            self._tt_values = state.values
+            self._tt_player = self.player_id
+        return self._hasher.hash_state(state)
+
+    def search_stats(self):
+        return {"nodes": self.nodes_searched, "depth": self.depth_reached}
+
+    def move(self, state):
         #whose turn?
-        moves_made = sum(row.count(0) for row in internal_board)
-        player_id = 2 if moves_made % 2 else 1
-        self.player_id = player_id
-
-        root = AlphaBetaNode(internal_board, last_move, player_id, scores=scores)
-        if root.is_terminal():
+        self.player_id = state.current_player + 1
+        self.nodes_searched = 0
+        self.depth_reached = 0
+        self.endgame_margin = None
+
+        # the search works on a private copy, so the caller's state is never modified
+        work = state.copy()
+        if work.is_over():
             return None
+        large = state.n > self.large_board
+        self._beam = self.beam_width if self.beam_width is not None else (LARGE_BRANCHING if large else None)
+
+        # few reachable cells left: play the provably optimal move
+        # (with a time limit the solver gets half of it, the search below what is left;
+        # without one it is capped by endgame_time_limit)
+        start = time.perf_counter()
+        solve_limit = self.time_limit / 2 if self.time_limit is not None else self.endgame_time_limit
+        solved = self.endgame.try_solve(work, self.endgame_threshold, solve_limit)
+        if solved is not None:
+            best_move, self.endgame_margin = solved
+            return best_move
+
+        cells = work.cells
+        root_hash = self._prepare_tt(work) if self.tt is not None and not large else None
+
+        # root move ordering: try larger picks first (helps pruning). Equal evaluations keep the first
+        # move of this order, i.e. the larger pick (the original node version sorted by the already
+        # taken cell, always 0, so it kept the generation order and could choose another tied move)
+        if self._beam:
+            moves = work.best_moves(self._beam)
+        else:
+            moves = work.legal_moves()
+            moves.sort(key=lambda m: cells[m[0]][m[1]], reverse=True)
+
+        if self.time_limit is None:
+            # choose depth dynamically
+            depth = self._dynamic_depth(work)
+            best_move, _ = self._search_root(work, moves, depth, root_hash)
+            self.depth_reached = depth
+            return best_move
+
+        # iterative deepening: depth 1, 2, 3, ... until the deadline, never deeper than the
+        # remaining plies (the game is then searched to the end) or the safety cap
+        max_depth = min(work.index.free_count, self.hard_depth_cap)
+        deadline = start + self.time_limit
+        best_move = moves[0]
+        for depth in range(1, max_depth + 1):
+            # depth 1 always completes, so there is a result even with a tiny time limit
+            self._deadline = deadline if depth > 1 else None
+            try:
+                best_move, values = self._search_root(work, moves, depth, root_hash)
+            except _SearchTimeout:
+                # unfinished iteration: discard it, the state is restored below
+                while work.moves_made > state.moves_made:
+                    work.undo()
+                break
+            self.depth_reached = depth
+            # next iteration starts with the best move of this one, then by this iteration's values
+            moves.sort(key=lambda m: values[m], reverse=True)
+            if time.perf_counter() >= deadline:
+                break
+        self._deadline = None
+        return best_move
 
-        # choose depth dynamically
-        depth = self._dynamic_depth(internal_board, last_move)
-
+    def _search_root(self, work: GameState, moves, depth: int, root_hash: Optional[int]):
+        # full-window search of every root move; returns (best move, {move: value})
         best_move, best_val = None, -math.inf
-        children = root.generate_children()
-        # root move ordering: try larger picks first (helps pruning)
-        children.sort(key=lambda ch: ch.board[ch.move[0]][ch.move[1]], reverse=True)
-
-        for ch in children:
-            val = self.alpha_beta(ch, depth - 1, -math.inf, math.inf, False)
+        values = {}
+        for m in moves:
+            child_hash = self._hasher.after_move(root_hash, work.last_move, m) if root_hash is not None else None
+            work.apply(m)
+            val = self.alpha_beta(work, depth - 1, -math.inf, math.inf, False, child_hash)
+            work.undo()
+            values[m] = val
             if val > best_val:
-                best_val, best_move = val, ch.move
+                best_val, best_move = val, m
 
         if best_move is None:
             # fallback: greedy
-            avail = root.get_available_moves()
-            best_move = max(avail, key=lambda m: internal_board[m[0]][m[1]])
-        return best_move
+            best_move = moves[0]
+        return best_move, values
 
     # Heuristic (root-player centric)
     # Evaluation function:
@@ -187,37 +205,34 @@ class AlphaBetaStrategy(Strategy):
             # - row/col potential: remaining numeric value in the last-move row and column
             # Small weights keep the heuristic stable and avoid oscillations.
 
-    def evaluate(self, node: AlphaBetaNode) -> float:
+    def evaluate(self, state: GameState, n_moves: int) -> float:
         # fast heuristic. Positive is better for the ROOT player (self.player_id).
+        # n_moves: number of legal moves of the side to move in `state`.
         # Terms:
         #  - score difference (me - opp)
         #  - mobility proxy (who is to move soon and how many options)
         #  - row/column potential around the last move (available totals)
         
         p = self.player_id  # Root player id
-        me  = node.scores[p - 1]
-        opp = node.scores[2 - p]
+        me  = state.scores[p - 1]
+        opp = state.scores[2 - p]
         score_diff = me - opp
 
         # Mobility proxy: favor states where the ROOT will soon have many options
         my_moves = 0
         opp_moves = 0
         #if next player to move equals root, then mobility is about this node
-        avail = node.get_available_moves()
-        if node.player_id == p:
-            my_moves = len(avail)
+        if state.current_player + 1 == p:
+            my_moves = n_moves
         else:
-            opp_moves = len(avail)
+            opp_moves = n_moves
 
-        # Row/col potential based on last move band (remaining sums)
+        # Row/col potential based on last move band (remaining sums, kept by the move index)
         row_col_potential = 0
-        if node.last_move is not None:
-            r, c = node.last_move
-            n = len(node.board)
-            # sum remaining values in row r and col c
-            row_sum = sum(v for v in node.board[r] if v != 0)
-            col_sum = sum(node.board[rr][c] for rr in range(n) if node.board[rr][c] != 0)
-            row_col_potential = row_sum + col_sum
+        if state.last_move is not None:
+            r, c = state.last_move
+            index = state.index
+            row_col_potential = index.row_sum[r] + index.col_sum[c]
 
         # tunable weights (kept small to maintain evaluation stability)
         return (
@@ -226,20 +241,52 @@ class AlphaBetaStrategy(Strategy):
             0.05 * row_col_potential
         )
 
-    # Alpha-Beta core with move ordering
+    # Alpha-Beta core with move ordering (make/unmake on one state)
+
+    def alpha_beta(self, state: GameState, depth: int, alpha: float, beta: float, maximizing_player: bool,
+                   key: Optional[int] = None) -> float:
+        # key: Zobrist hash of `state` (None -> no transposition table lookups)
+        self.nodes_searched += 1
+        # look at the clock only every 1024 nodes
+        if self._deadline is not None and not self.nodes_searched & 1023 and time.perf_counter() >= self._deadline:
+            raise _SearchTimeout()
+        beam = self._beam
+        if beam:
+            # beam: only the best moves by value are searched (both sides), already in MAX-node order;
+            # leaves only need the number of moves
+            n_moves = state.legal_move_count()
+            moves = state.best_moves(beam) if depth and n_moves else []
+        else:
+            moves = state.legal_moves()
+            n_moves = len(moves)
 
-    def alpha_beta(self, node: AlphaBetaNode, depth: int, alpha: float, beta: float, maximizing_player: bool) -> float:
         #terminal or cutoff
-        if depth == 0 or node.is_terminal():
-            return self.evaluate(node)
+        if depth == 0 or not n_moves:
+            return self.evaluate(state, n_moves)
+
+        # transposition table: values are stored relative to the ROOT player's score difference
+        tt = self.tt if key is not None else None
+        tt_move = None
+        if tt is not None:
+            p = self.player_id
+            diff = state.scores[p - 1] - state.scores[2 - p]
+            entry = tt.probe(key)
+            if entry is not None:
+                e_depth, bound, stored, tt_move = entry
+                if e_depth >= depth:
+                    stored += diff
+                    if bound == EXACT:
+                        return stored
+                    if bound == LOWER:
+                        alpha = max(alpha, stored)
+                    else:
+                        beta = min(beta, stored)
+                    if beta <= alpha:
+                        return stored
+            alpha_orig, beta_orig = alpha, beta
+            hasher = self._hasher
+            last_move = state.last_move
 
-        children = node.generate_children()
-
-        # Move ordering:
-        # For maximizing (root's opponent False/True alternates), order using the
-        # root-player's current score seen in child to bias toward promising branches.
-        root_pid = self.player_id
-        
         # maximizing_player:
         # true  → we choose the move that maximizes evaluation for the ROOT player
         # false → opponent's turn; they choose a move that minimizes the ROOT score
@@ -247,24 +294,48 @@ class AlphaBetaStrategy(Strategy):
         # This alternation implements the minimax logic.
 
         if maximizing_player:
-            # MAX node: try children that improve ROOT's score sooner
-            children.sort(key=lambda ch: ch.scores[root_pid - 1], reverse=True)
+            # MAX node: try moves that improve ROOT's score sooner (the ROOT collects the cell value)
+            cells = state.cells
+            moves.sort(key=lambda m: cells[m[0]][m[1]], reverse=True)
+        # MIN node: the ROOT's score does not change on the opponent's move, keep generation order
+
+        # the best move stored for this position is tried first
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        best_move = None
+        if maximizing_player:
             value = -math.inf
-            for child in children:
-                value = max(value, self.alpha_beta(child, depth - 1, alpha, beta, False))
+            for m in moves:
+                child_key = hasher.after_move(key, last_move, m) if tt is not None else None
+                state.apply(m)
+                child_value = self.alpha_beta(state, depth - 1, alpha, beta, False, child_key)
+                state.undo()
+                if child_value > value:
+                    value, best_move = child_value, m
                 alpha = max(alpha, value)
                 if beta <= alpha:
                     break  # Beta cut
-            return value
         else:
-            # MIN node: try children that hurt ROOT's score sooner
-            children.sort(key=lambda ch: ch.scores[root_pid - 1])
             value = math.inf
-            for child in children:
-                value = min(value, self.alpha_beta(child, depth - 1, alpha, beta, True))
+            for m in moves:
+                child_key = hasher.after_move(key, last_move, m) if tt is not None else None
+                state.apply(m)
+                child_value = self.alpha_beta(state, depth - 1, alpha, beta, True, child_key)
+                state.undo()
+                if child_value < value:
+                    value, best_move = child_value, m
                 beta = min(beta, value)
                 if beta <= alpha:
                     break  # alpha cut
-            return value
-
 
+        if tt is not None:
+            if value <= alpha_orig:
+                bound = UPPER
+            elif value >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            tt.store(key, depth, bound, value - diff, best_move)
+        return value
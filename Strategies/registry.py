@@ -0,0 +1,53 @@
+import importlib
+
+# The one list of all strategies: name -> (module, class, label in the game setup).
+# The names are the ones used in the simulation results. A strategy module is only imported when the
+# strategy is created, so the game setup, or a simulation worker that only plays Greedy, does not
+# load MCTS, Minimax and what they import.
+STRATEGIES = {
+    "Random": ("Strategies.RandomStrategy", "RandomStrategy", "Random Strategy"),
+    "Greedy": ("Strategies.GreedyStrategy", "GreedyStrategy", "Greedy Strategy"),
+    "SafeChoice": ("Strategies.safe_choice_strategy", "SafeChoiceStrategy", "Safe Choice Strategy"),
+    "MCTS": ("Strategies.MCTS", "MCTSStrategy", "Monte Carlo Tree Search Strategy"),
+    "Minimax": ("Strategies.minimax_f", "AlphaBetaStrategy", "Minimax"),
+}
+
+# strategies that implement batch_move and can play in the batch engine (Simulations/BatchEngine.py)
+BATCH_STRATEGIES = {"Random", "Greedy"}
+
+
+def strategy_names():
+    return list(STRATEGIES)
+
+
+def strategy_label(name):
+    """name of the strategy as shown in the game setup"""
+    return STRATEGIES[canonical_name(name)][2]
+
+
+def canonical_name(name):
+    """
+    registry name of a strategy. Case and underscores are ignored, so the old names of the
+    game setup ("safe_choice", "minimax", ...) still work
+    """
+    key =name.replace("_", "").lower()
+    for registered in STRATEGIES:
+        if registered.lower() ==key:
+            return registered
+    raise ValueError(f"{name}-strategy not existent for game")
+
+
+def supports_batch(name):
+    """whether the strategy can play many games at once in the batch engine"""
+    return canonical_name(name) in BATCH_STRATEGIES
+
+
+def strategy_class(name):
+    """the strategy class, its module is imported on first use"""
+    module, cls, _ =STRATEGIES[canonical_name(name)]
+    return getattr(importlib.import_module(module), cls)
+
+
+def create_strategy(name, **kwargs):
+    """new instance of the strategy `name`; kwargs are passed to its constructor"""
+    return strategy_class(name)(**kwargs)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def batch_rollout(state, k, epsilon=0.5, rng=None, max_plies=None):
+    """
+    Plays `k` epsilon-greedy playouts from `state` at once on stacked integer boards.
+
+    All playouts advance in lockstep, one ply per loop iteration. Per ply and per playout,
+    only the 2N cells of the last move's row and column are candidates, so a ply costs
+    O(k * N) vectorized work:
+      - with probability `epsilon` a uniformly random legal cell is taken,
+      - otherwise the legal cell with the highest value (first one on ties, like max()).
+    Playouts without a legal move are finished and stop changing. With `max_plies`, all playouts
+    are stopped after that many plies and scored as they are.
+
+    Returns a float array of length k with the final score difference
+    (side to move in `state` minus opponent) of every playout.
+    `state` is not modified.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    n = state.n
+    values = state.values
+    free = np.broadcast_to(state.free, (k, n, n)).copy()
+    games = np.arange(k)
+
+    me = state.current_player
+    diff = np.full(k, float(state.scores[me] - state.scores[1 - me]))
+    sign = 1.0   # +1 while the side to move in `state` is moving
+
+    if state.last_move is None:
+        # first ply of the game: every free cell is a candidate
+        flat_free = free.reshape(k, n * n)
+        if not flat_free.any():
+            return diff
+        flat_values = values.reshape(n * n)
+        choice = _epsilon_greedy(flat_free, np.broadcast_to(flat_values, (k, n * n)), epsilon, rng)
+        last_r, last_c = choice // n, choice % n
+        free[games, last_r, last_c] = False
+        diff += flat_values[choice]
+        sign = -1.0
+    else:
+        last_r = np.full(k, state.last_move[0])
+        last_c = np.full(k, state.last_move[1])
+
+    active = np.ones(k, dtype=bool)
+    plies = 1 if state.last_move is None else 0   # plies played so far
+    while max_plies is None or plies < max_plies:
+        # candidates: row of the last move (index j -> (last_r, j)) then its column (index N+i -> (i, last_c))
+        legal = np.concatenate((free[games, last_r, :], free[games, :, last_c]), axis=1)
+        active &= legal.any(axis=1)
+        if not active.any():
+            break
+        cand_values = np.concatenate((values[last_r, :], values[:, last_c].T), axis=1)
+
+        choice = _epsilon_greedy(legal, cand_values, epsilon, rng)
+        in_row = choice < n
+        r = np.where(in_row, last_r, choice - n)
+        c = np.where(in_row, choice, last_c)
+
+        # finished playouts keep their last move; only active ones take a cell and score
+        r = np.where(active, r, last_r)
+        c = np.where(active, c, last_c)
+        free[games[active], r[active], c[active]] = False
+        diff += sign * np.where(active, values[r, c], 0)
+
+        last_r, last_c = r, c
+        sign = -sign
+        plies += 1
+
+    return diff
+
+
+def _epsilon_greedy(legal, cand_values, epsilon, rng):
+    """index of the chosen candidate per row of `legal` (rows without legal cells return garbage)"""
+    k = legal.shape[0]
+    # random: legal cell with the largest random key
+    random_pick = np.where(legal, rng.random(legal.shape), -1.0).argmax(axis=1)
+    # greedy: first legal cell with the largest value
+    greedy_pick = np.where(legal, cand_values, np.iinfo(np.int64).min).argmax(axis=1)
+    return np.where(rng.random(k) < epsilon, random_pick, greedy_pick)
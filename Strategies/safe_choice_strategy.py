@@ -1,8 +1,13 @@
+import random
 from typing import List, Optional, Tuple, Dict
+import numpy as np
 from Strategies.Strategy import Strategy
+from Game.GameState import GameState
 
 Coord = Tuple[int, int]
-Matrix = List[List[object]]  # numbers or '-' for used cells
+
+# with more legal moves than this (first move, large boards) all candidates are scored at once with NumPy
+VECTORIZE_ABOVE = 64
 
 
 class SafeChoiceStrategy(Strategy):
@@ -20,6 +25,10 @@ class SafeChoiceStrategy(Strategy):
         α=1.0, β=1.0, γ=0.15, δ=0.05, ε=0.05
 
     Tie-break: higher composite_score, then more +1s, then a, then b, then bottom-rightmost cell.
+
+    Row/column maxima and their multiplicities come from the move index, so a candidate costs O(1)
+    (a row or column is only scanned when the candidate is its unique maximum). With more than
+    VECTORIZE_ABOVE candidates the same scores are computed as NumPy arrays (`_move_vectorized`).
     """
 
     def __init__(self,
@@ -44,8 +53,8 @@ class SafeChoiceStrategy(Strategy):
         self._col_summary_cache: Dict[int, Tuple[Optional[float], int, Optional[float], int]] = {}
 
     # public API
-    def move(self, matrix: Matrix, last_move: Optional[Coord], scores) -> Optional[Coord]:
-        n = len(matrix)
+    def move(self, state: GameState) -> Optional[Coord]:
+        n = state.n
         if n == 0:
             return None
 
@@ -53,7 +62,10 @@ class SafeChoiceStrategy(Strategy):
         self._row_summary_cache.clear()
         self._col_summary_cache.clear()
 
-        candidates = self._valid_moves(matrix, last_move)
+        if state.legal_move_count() > VECTORIZE_ABOVE:
+            return self._move_vectorized(state)
+
+        candidates = state.legal_moves()
         if not candidates:
             return None
 
@@ -61,18 +73,18 @@ class SafeChoiceStrategy(Strategy):
         best_key = None
 
         for (i, j) in candidates:
-            v = self._cell_value(matrix, i, j)
+            v = self._cell_value(state, i, j)
             if v is None:
                 # defensive: shouldn't happen due to _valid_moves filter
                 continue
 
             #parity features from current board state
-            a = self._parity_from_row_excluding(i, j, v, self._top2_summary_row(matrix, i))
-            b = self._parity_from_col_excluding(i, j, v, self._top2_summary_col(matrix, j))
+            a = self._parity_from_row_excluding(i, j, v, self._row_summary(state, i, v))
+            b = self._parity_from_col_excluding(i, j, v, self._col_summary(state, j, v))
             ones = (1 if a == 1 else 0) + (1 if b == 1 else 0)
 
             # opponent's best immediate reply after we take (i, j)
-            opp_best = self._opponent_best_after(matrix, i, j)
+            opp_best = self._opponent_best_after(state, i, j)
 
             composite = (
                 self.alpha * v
@@ -87,7 +99,6 @@ class SafeChoiceStrategy(Strategy):
             #add tiny jitter if requested to avoid always picking same path under deep ties
             jitter = 0.0
             if self.jitter:
-                import random
                 jitter = random.random() * self.jitter
 
             key = (composite + jitter, ones, a, b, -i, -j)
@@ -98,76 +109,130 @@ class SafeChoiceStrategy(Strategy):
 
         return best
 
-    # helpers: validity & primitive values
-    @staticmethod
-    def _is_free(val: object) -> bool:
-        return val != '-'
+    def _move_vectorized(self, state: GameState) -> Optional[Coord]:
+        """
+        move() for many candidates: the same scores and tie-breaks, computed for all candidates at once
+        """
+        if state.last_move is None:
+            rows, cols = np.nonzero(state.free)   # row-major, like legal_moves()
+        else:
+            candidates = state.legal_moves()
+            rows = np.array([m[0] for m in candidates], dtype=np.int64)
+            cols = np.array([m[1] for m in candidates], dtype=np.int64)
+        if not len(rows):
+            return None
+
+        index = state.index
+        v = state.values[rows, cols].astype(float)
+        a, row_opp = self._band_features(state, v, rows, index.row_max, index.row_max_count, self._top2_summary_row)
+        b, col_opp = self._band_features(state, v, cols, index.col_max, index.col_max_count, self._top2_summary_col)
+        ones = (a == 1).astype(int) + (b == 1).astype(int)
+
+        # opponent's best reply in row i or column j, 0 if there is none
+        opp_best = np.maximum(row_opp, col_opp)
+        opp_best[opp_best == float("-inf")] = 0.0
 
+        composite = self.alpha * v - self.beta * opp_best + self.gamma * ones + self.delta * a + self.epsilon * b
+        if self.jitter:
+            composite = composite + np.array([random.random() for _ in range(len(v))]) * self.jitter
+
+        # same ordering key as move(): composite, ones, a, b, then bottom-rightmost (last key = primary)
+        best = np.lexsort((-cols, -rows, b, a, ones, composite))[-1]
+        return (int(rows[best]), int(cols[best]))
+
+    def _band_features(self, state, v, lines, line_max, line_max_count, summary):
+        """
+        parity feature and opponent's best value in the row (or column) of every candidate, excluding the
+        candidate itself. `lines` are the candidates' row (column) numbers, `summary` the cached top-2 scan
+        that is only needed for candidates holding the unique maximum of their line.
+        """
+        top1 = np.array(line_max, dtype=float)[lines]
+        cnt1 = np.array(line_max_count)[lines]
+        is_top = v == top1
+        unique = is_top & (cnt1 == 1)
+
+        # second largest value of the line and its count, for unique maxima only
+        top2 = np.full(len(v), float("-inf"))
+        cnt2 = np.zeros(len(v), dtype=int)
+        for k in np.flatnonzero(unique):
+            _, _, second, second_count = summary(state, int(lines[k]))
+            if second is not None:
+                top2[k] = second
+            cnt2[k] = second_count
+
+        m = np.where(is_top, np.where(cnt1 > 1, cnt1 - 1, cnt2), cnt1)
+        parity = np.where(m % 2 == 0, 1, -1)
+        opp = np.where(unique, top2, top1)
+        return parity, opp
+
+    # helpers: validity & primitive values
     @staticmethod
-    def _cell_value(matrix: Matrix, i: int, j: int) -> Optional[float]:
-        val = matrix[i][j]
-        return None if val == '-' else float(val)
-
-    def _valid_moves(self, matrix: Matrix, last_move: Optional[Coord]) -> List[Coord]:
-        n = len(matrix)
-        if last_move is None:
-            return [(i, j) for i in range(n) for j in range(n) if self._is_free(matrix[i][j])]
-        r0, c0 = last_move
-        out: List[Coord] = []
-        seen = set()
-        # same row
-        for j in range(n):
-            if self._is_free(matrix[r0][j]):
-                out.append((r0, j))
-                seen.add((r0, j))
-        # same column
-        for i in range(n):
-            if self._is_free(matrix[i][c0]) and (i, c0) not in seen:
-                out.append((i, c0))
-        return out
+    def _cell_value(state: GameState, i: int, j: int) -> Optional[float]:
+        return float(state.cells[i][j]) if state.free[i, j] else None
 
     # opponent look-ahead (1 ply)
-    def _opponent_best_after(self, matrix: Matrix, i: int, j: int) -> float:
+    def _opponent_best_after(self, state: GameState, i: int, j: int) -> float:
         """
         After we take (i, j), opponent must play in row i or column j on remaining cells.
         We don't need to mutate the board; just ignore (i, j) in the scan.
         """
-        n = len(matrix)
+        index = state.index
+        cells = state.cells
         best_val = float("-inf")
 
-        # row i excluding j
-        for jj in range(n):
-            if jj == j:
-                continue
-            v = self._cell_value(matrix, i, jj)
-            if v is not None:
-                if v > best_val:
-                    best_val = v
+        # row i excluding j: unless (i, j) is the only cell holding the row maximum, the index knows the answer
+        if index.row_max[i] is not None:
+            if cells[i][j] != index.row_max[i] or index.row_max_count[i] > 1:
+                best_val = float(index.row_max[i])
+            else:
+                for jj in index.row_free[i]:
+                    if jj != j and cells[i][jj] > best_val:
+                        best_val = float(cells[i][jj])
 
         # column j excluding i
-        for ii in range(n):
-            if ii == i:
-                continue
-            v = self._cell_value(matrix, ii, j)
-            if v is not None:
-                if v > best_val:
-                    best_val = v
+        if index.col_max[j] is not None:
+            if cells[i][j] != index.col_max[j] or index.col_max_count[j] > 1:
+                best_val = max(best_val, float(index.col_max[j]))
+            else:
+                for ii in index.col_free[j]:
+                    if ii != i and cells[ii][j] > best_val:
+                        best_val = float(cells[ii][j])
 
         if best_val == float("-inf"):
             return 0.0  # no reply available
         return best_val
 
     # summaries & parity (reuse your top-2 logic with caching)
-    def _top2_summary_row(self, matrix: Matrix, i: int):
+    def _row_summary(self, state: GameState, i: int, v: float):
+        """
+        (top1, cnt1, top2, cnt2) of row i as far as the parity of a cell with value v needs it:
+        top2/cnt2 are only used when v is the unique maximum, otherwise the move index suffices
+        """
+        index = state.index
+        top1, cnt1 = index.row_max[i], index.row_max_count[i]
+        if top1 is not None and v == top1 and cnt1 == 1:
+            return self._top2_summary_row(state, i)
+        return (None if top1 is None else float(top1), cnt1, None, 0)
+
+    def _col_summary(self, state: GameState, j: int, v: float):
+        index = state.index
+        top1, cnt1 = index.col_max[j], index.col_max_count[j]
+        if top1 is not None and v == top1 and cnt1 == 1:
+            return self._top2_summary_col(state, j)
+        return (None if top1 is None else float(top1), cnt1, None, 0)
+
+    def _top2_summary_row(self, state: GameState, i: int):
         if i not in self._row_summary_cache:
-            vals = [self._cell_value(matrix, i, j) for j in range(len(matrix)) if self._is_free(matrix[i][j])]
-            self._row_summary_cache[i] = self._top2_from_values([v for v in vals if v is not None])
+            cells_row = state.cells[i]
+            vals = [float(cells_row[j]) for j in state.index.row_free[i]]
+            self._row_summary_cache[i] = self._top2_from_values(vals)
         return self._row_summary_cache[i]
 
-    def _top2_summary_col(self, matrix: Matrix, j: int):
+    def _top2_summary_col(self, state: GameState, j: int):
         if j not in self._col_summary_cache:
-            vals = [self._cell_value(matrix, i, j) for i in range(len(matrix)) if self._is_free(matrix[i][j])]
-            self._col_summary_cache[j] = self._top2_from_values([v for v in vals if v is not None])
+            cells = state.cells
+            vals = [float(cells[i][j]) for i in state.index.col_free[j]]
+            self._col_summary_cache[j] = self._top2_from_values(vals)
         return self._col_summary_cache[j]
 
     @staticmethod
@@ -0,0 +1,101 @@
+import random
+from typing import Optional, Tuple
+
+# bound types stored with every entry
+EXACT = 0   # value is the exact minimax value at the stored depth
+LOWER = 1   # search failed high: true value >= stored value
+UPPER = 2   # search failed low:  true value <= stored value
+
+
+class ZobristHasher:
+    """
+    Zobrist keys for the Row-Column game.
+
+    A position is identified by (free-cell mask, last move, side to move); the cell
+    values and scores are not part of the key (values are fixed per board, scores are
+    handled by the search storing values relative to the current score difference).
+
+    hash = XOR of taken[r][c] for every taken cell
+           ^ last[r][c] of the last move (nothing before the first move)
+           ^ side if player 2 is to move
+    """
+
+    def __init__(self, n: int, seed: int = 0x5EED):
+        rng = random.Random(seed)
+        self.n = n
+        self.taken = [[rng.getrandbits(64) for _ in range(n)] for _ in range(n)]
+        self.last = [[rng.getrandbits(64) for _ in range(n)] for _ in range(n)]
+        self.side = rng.getrandbits(64)
+
+    def hash_state(self, state) -> int:
+        """full hash of a GameState (used once at the root, afterwards updated incrementally)"""
+        h = 0
+        for r in range(self.n):
+            taken_row = self.taken[r]
+            free_cols = set(state.index.row_free[r])
+            for c in range(self.n):
+                if c not in free_cols:
+                    h ^= taken_row[c]
+        if state.last_move is not None:
+            h ^= self.last[state.last_move[0]][state.last_move[1]]
+        if state.current_player == 1:
+            h ^= self.side
+        return h
+
+    def after_move(self, h: int, last_move: Optional[Tuple[int, int]], move: Tuple[int, int]) -> int:
+        """hash of the position reached by playing `move` in the position `h` whose last move was `last_move`"""
+        r, c = move
+        h ^= self.taken[r][c] ^ self.last[r][c] ^ self.side
+        if last_move is not None:
+            h ^= self.last[last_move[0]][last_move[1]]
+        return h
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results, indexed by the low bits of a Zobrist key.
+
+    Each slot stores (key, depth, bound, value, best_move). `size` is rounded up to a
+    power of two. Replacement policies when two positions map to the same slot:
+      - "depth":  keep the entry that was searched deeper (a new entry for the same
+                  position always replaces the old one)
+      - "always": the newest entry always wins
+    """
+
+    def __init__(self, size: int = 1 << 18, replacement: str = "depth"):
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        slots = 1
+        while slots < max(1, size):
+            slots <<= 1
+        self.mask = slots - 1
+        self.replacement = replacement
+        self.keys = [None] * slots
+        self.entries = [None] * slots
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        slots = self.mask + 1
+        self.keys = [None] * slots
+        self.entries = [None] * slots
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key: int):
+        """(depth, bound, value, best_move) stored for `key`, or None"""
+        slot = key & self.mask
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.entries[slot]
+        return None
+
+    def store(self, key: int, depth: int, bound: int, value: float, best_move):
+        slot = key & self.mask
+        old_key = self.keys[slot]
+        if (self.replacement == "depth" and old_key is not None and old_key != key
+                and self.entries[slot][0] > depth):
+            return  # keep the deeper entry of a different position
+        self.keys[slot] = key
+        self.entries[slot] = (depth, bound, value, best_move)
+        self.stores += 1
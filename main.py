@@ -1,5 +1,4 @@
 from Game.GameSetup import GameSetup
-from Game.GameHandler import GameHandler
 
 # initializes and runs a GameSetup
 setup = GameSetup()
@@ -10,5 +9,7 @@ p1 = config[0]
 p2 = config[1]
 
 # initializes and runs a GameHandler that will start the game
+# (imported only now: the game state needs NumPy, the setup window does not -> it opens faster)
+from Game.GameHandler import GameHandler
 game=GameHandler(player1=p1, player2=p2)
 game.play()
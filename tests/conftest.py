@@ -0,0 +1,5 @@
+import os
+import sys
+
+#the modules import each other as Game.*, Strategies.*, Simulations.* -> repository root on the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from Simulations.SimulationHandler import SimulationRunner
+
+
+def make_runner(checkpoint, resume=False):
+    return SimulationRunner(strategies=["Random", "Greedy"], board_dims=[3, 4], boards_per_size={3: 4, 4: 3},
+                            seed=11, checkpoint=str(checkpoint), resume=resume)
+
+
+def test_resume_after_a_kill_gives_the_same_results(tmp_path):
+    full =make_runner(tmp_path/"full.jsonl")
+    full.run_iteration()
+
+    #simulate a run killed in the middle of writing a line: header, some finished units, a cut-off line
+    lines =(tmp_path/"full.jsonl").read_text().splitlines(keepends=True)
+    assert json.loads(lines[0]) =={"seed": 11}
+    assert len(lines) ==1+4+3
+    (tmp_path/"killed.jsonl").write_text("".join(lines[:4])+lines[4][:10])
+
+    resumed =make_runner(tmp_path/"killed.jsonl", resume=True)
+    assert len(resumed.completed) ==3
+    resumed.run_iteration()
+    assert resumed.results ==full.results
+
+    #the checkpoint is complete again, every unit on a line of its own
+    units =[json.loads(line) for line in (tmp_path/"killed.jsonl").read_text().splitlines()[1:]]
+    assert sorted((u["size"], u["board"]) for u in units) ==sorted((u["size"], u["board"]) for u in
+                                                                   map(json.loads, lines[1:]))
+
+
+def test_existing_checkpoint_needs_resume(tmp_path):
+    make_runner(tmp_path/"run.jsonl")
+    with pytest.raises(FileExistsError):
+        make_runner(tmp_path/"run.jsonl")
+
+
+def test_resume_with_another_seed_is_rejected(tmp_path):
+    make_runner(tmp_path/"run.jsonl").run_iteration()
+    with pytest.raises(ValueError):
+        SimulationRunner(strategies=["Random", "Greedy"], board_dims=[3], boards_per_size={3: 4}, seed=12,
+                         checkpoint=str(tmp_path/"run.jsonl"), resume=True)
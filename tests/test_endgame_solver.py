@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+
+from Game.GameState import GameState
+from Strategies.endgame_solver import EndgameSolver
+
+
+def brute_force_margin(state):
+    #plain minimax over the GameState: best final margin (own score - opponent's) for the side to move
+    moves =state.legal_moves()
+    if not moves:
+        return state.scores[state.current_player]-state.scores[1-state.current_player]
+    best =None
+    for move in moves:
+        state.apply(move)
+        value =-brute_force_margin(state)
+        state.undo()
+        if best is None or value> best:
+            best =value
+    return best
+
+
+def test_solver_matches_brute_force_on_small_boards():
+    rng =random.Random(5)
+    solver =EndgameSolver()
+    for n in (2, 3):
+        for _ in range(10):
+            state =GameState(np.array([[rng.randint(1, 9) for _ in range(n)] for _ in range(n)]))
+            while not state.is_over():
+                move, margin =solver.solve(state)
+                assert margin ==brute_force_margin(state)
+                #the returned move must reach that margin
+                state.apply(move)
+                assert -brute_force_margin(state) ==margin
+                state.undo()
+                state.apply(rng.choice(state.legal_moves()))
+
+
+def test_solver_matches_brute_force_late_in_a_larger_game():
+    rng =random.Random(6)
+    solver =EndgameSolver()
+    for _ in range(5):
+        state =GameState(np.array([[rng.randint(1, 9) for _ in range(4)] for _ in range(4)]))
+        for _ in range(6):
+            state.apply(rng.choice(state.legal_moves()))
+        if state.is_over():
+            continue
+        assert solver.solve(state)[1] ==brute_force_margin(state)
+
+
+def test_try_solve_respects_threshold_and_time_limit():
+    rng =random.Random(7)
+    state =GameState(np.array([[rng.randint(1, 9) for _ in range(6)] for _ in range(6)]))
+    solver =EndgameSolver()
+    assert solver.try_solve(state, 0) is None
+    assert solver.try_solve(state, 10) is None        #36 reachable cells
+    assert solver.try_solve(state, 36, time_limit=0.0) is None
+    state =GameState([[1, 2], [3, 4]])
+    assert solver.try_solve(state, 4) ==solver.solve(state)
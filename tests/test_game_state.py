@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+
+from Game.GameState import GameState
+from Game.MoveIndex import MoveIndex
+
+
+def brute_force_moves(state):
+    #legal moves straight from the free mask: any free cell first, then row + column of the last move
+    n =state.n
+    if state.last_move is None:
+        return {(r, c) for r in range(n) for c in range(n) if state.free[r, c]}
+    r0, c0 =state.last_move
+    return {(r, c) for r in range(n) for c in range(n) if state.free[r, c] and (r ==r0 or c ==c0)}
+
+
+def index_snapshot(index):
+    return (index.row_free, index.col_free, index.row_count, index.col_count, index.row_sum, index.col_sum,
+            index.row_max, index.col_max, index.row_max_count, index.col_max_count, index.free_count)
+
+
+def test_index_matches_a_fresh_index_after_every_move():
+    rng =random.Random(1)
+    for n in (1, 2, 5, 7):
+        values =np.array([[rng.randint(1, 4) for _ in range(n)] for _ in range(n)])
+        state =GameState(values)
+        while not state.is_over():
+            assert set(state.legal_moves()) ==brute_force_moves(state)
+            assert state.legal_move_count() ==len(brute_force_moves(state))
+            state.apply(rng.choice(state.legal_moves()))
+
+            #an index built from scratch on the same taken cells must have the same counts, sums and maxima
+            fresh =MoveIndex(state.cells)
+            for r in range(n):
+                for c in range(n):
+                    if not state.free[r, c]:
+                        fresh.take(r, c)
+            assert index_snapshot(state.index) ==index_snapshot(fresh)
+
+
+def test_undo_restores_every_field():
+    rng =random.Random(2)
+    state =GameState(np.array([[rng.randint(1, 9) for _ in range(6)] for _ in range(6)]))
+    snapshots =[]
+    while not state.is_over():
+        snapshots.append((state.free.copy(), list(state.scores), state.last_move, state.current_player,
+                          state.moves_made, index_snapshot(state.index.copy())))
+        state.apply(rng.choice(state.legal_moves()))
+
+    while snapshots:
+        free, scores, last_move, player, moves_made, index =snapshots.pop()
+        state.undo()
+        assert (state.free ==free).all()
+        assert state.scores ==scores
+        assert state.last_move ==last_move
+        assert state.current_player ==player
+        assert state.moves_made ==moves_made
+        assert index_snapshot(state.index) ==index
+
+
+def test_scores_and_copy_are_independent():
+    state =GameState([[5, 1], [2, 7]])
+    assert state.apply((1, 1)) ==7
+    other =state.copy()
+    other.apply((1, 0))
+    assert state.scores ==[7, 0] and other.scores ==[7, 2]
+    assert state.is_free(1, 0) and not other.is_free(1, 0)
+    assert state.played_moves() ==[(1, 1)]
+
+
+def test_best_moves_are_the_highest_legal_cells():
+    rng =random.Random(3)
+    state =GameState(np.array([[rng.randint(1, 20) for _ in range(8)] for _ in range(8)]))
+    for _ in range(20):
+        legal =state.legal_moves()
+        if not legal:
+            break
+        best =state.best_moves(3)
+        expected =sorted((state.value(*m) for m in legal), reverse=True)[:3]
+        assert [state.value(*m) for m in best] ==expected
+        state.apply(rng.choice(legal))
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+
+from Game.GameState import GameState
+from Strategies.transposition_table import ZobristHasher, TranspositionTable, EXACT, LOWER, UPPER
+
+
+def test_incremental_hash_equals_full_hash():
+    rng =random.Random(4)
+    state =GameState(np.array([[rng.randint(1, 9) for _ in range(5)] for _ in range(5)]))
+    hasher =ZobristHasher(state.n)
+    h =hasher.hash_state(state)
+    while not state.is_over():
+        move =rng.choice(state.legal_moves())
+        h =hasher.after_move(h, state.last_move, move)
+        state.apply(move)
+        assert h ==hasher.hash_state(state)
+
+
+def test_hash_covers_last_move_and_side_to_move():
+    hasher =ZobristHasher(3)
+    #same taken cells, different last move
+    a =GameState(np.ones((3, 3)))
+    a.apply((0, 0)); a.apply((0, 1))
+    b =GameState(np.ones((3, 3)))
+    b.apply((0, 1)); b.apply((0, 0))
+    assert hasher.hash_state(a) !=hasher.hash_state(b)
+    #transposition: same cells and last move reached in another order -> same key
+    c =GameState(np.ones((3, 3)))
+    c.apply((0, 2)); c.apply((1, 2)); c.apply((0, 0))
+    d =GameState(np.ones((3, 3)))
+    d.apply((1, 2)); d.apply((0, 2)); d.apply((0, 0))
+    assert hasher.hash_state(c) ==hasher.hash_state(d)
+
+
+def test_probe_returns_the_stored_entry():
+    table =TranspositionTable(16)
+    assert table.probe(5) is None
+    table.store(5, 3, EXACT, 1.5, (0, 1))
+    assert table.probe(5) ==(3, EXACT, 1.5, (0, 1))
+    #a key that only shares the slot is not a hit
+    assert table.probe(5+16) is None
+
+
+def test_depth_replacement_keeps_deeper_entry_of_another_position():
+    table =TranspositionTable(16, "depth")
+    table.store(1, 4, LOWER, 2.0, (1, 1))
+    table.store(1+16, 2, UPPER, -1.0, (0, 0))   #same slot, shallower -> ignored
+    assert table.probe(1) ==(4, LOWER, 2.0, (1, 1))
+    assert table.probe(1+16) is None
+    table.store(1+16, 5, UPPER, -1.0, (0, 0))   #deeper -> replaces
+    assert table.probe(1+16) ==(5, UPPER, -1.0, (0, 0))
+    #the same position is always updated, even with a shallower search
+    table.store(1+16, 1, EXACT, 0.0, (2, 2))
+    assert table.probe(1+16) ==(1, EXACT, 0.0, (2, 2))
+
+
+def test_always_replacement_keeps_newest_entry():
+    table =TranspositionTable(16, "always")
+    table.store(1, 4, EXACT, 2.0, None)
+    table.store(1+16, 1, EXACT, 3.0, None)
+    assert table.probe(1) is None
+    assert table.probe(1+16) ==(1, EXACT, 3.0, None)
+
+
+def test_size_is_rounded_up_and_clear_empties_the_table():
+    table =TranspositionTable(10)
+    assert table.mask ==15
+    table.store(3, 1, EXACT, 0.0, None)
+    table.clear()
+    assert table.probe(3) is None and table.stores ==0